@@ -1,5 +1,7 @@
 """CiteIQ package exports."""
 
+from typing import Any
+
 from .models import (  # noqa: F401
     CitationRecord,
     CitationScore,
@@ -7,7 +9,6 @@ from .models import (  # noqa: F401
     NormalizedReference,
     RawReference,
 )
-from .pipeline import ReferencePipeline, PipelineConfig  # noqa: F401
 
 __all__ = [
     "CitationRecord",
@@ -18,3 +19,13 @@ __all__ = [
     "ReferencePipeline",
     "PipelineConfig",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # The pipeline pulls in pandas, scikit-learn and matplotlib; import it on first use so
+    # ingest worker processes only load the light modules they need.
+    if name in ("ReferencePipeline", "PipelineConfig"):
+        from . import pipeline
+
+        return getattr(pipeline, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
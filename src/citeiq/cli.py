@@ -9,6 +9,7 @@ from typing import List, Optional
 import typer
 
 from .pipeline import PipelineConfig, ReferencePipeline
+from .report import DEFAULT_EXPORT_FORMATS, EXPORT_FORMATS
 
 # Configure logging for console output
 logging.basicConfig(
@@ -28,12 +29,23 @@ def process(
     email: Optional[str] = typer.Option(None, "--email", "-e", help="Contact email for Unpaywall API."),
     sort_mode: str = typer.Option("author", "--sort", "-s", help="Sort mode: author|year|order."),
     topic_clusters: int = typer.Option(8, "--topic-clusters", "-k", help="Desired number of topic clusters."),
+    formats: str = typer.Option(
+        ",".join(DEFAULT_EXPORT_FORMATS), "--formats", help="Comma-separated table exports: csv, parquet, xlsx."
+    ),
+    fuzzy_dedup: bool = typer.Option(
+        True, "--fuzzy-dedup/--no-fuzzy-dedup", help="Also flag duplicates by fuzzy title match (DOI matching always runs)."
+    ),
 ) -> None:
     """Run the full CiteIQ pipeline."""
     if not inputs:
         typer.echo("No input files provided.", err=True)
         raise typer.Exit(code=1)
 
+    export_formats = [fmt.strip().lower() for fmt in formats.split(",") if fmt.strip()]
+    unknown = sorted(set(export_formats) - set(EXPORT_FORMATS))
+    if unknown:
+        raise typer.BadParameter(f"unsupported format(s): {', '.join(unknown)}", param_hint="--formats")
+
     config = PipelineConfig(
         input_files=inputs,
         output_dir=output_dir,
@@ -41,6 +53,8 @@ def process(
         email=email,
         sort_mode=sort_mode,
         topic_clusters=topic_clusters,
+        export_formats=export_formats,
+        fuzzy_dedup=fuzzy_dedup,
     )
     pipeline = ReferencePipeline(config)
     result = pipeline.run()
@@ -4,15 +4,19 @@ from __future__ import annotations
 
 from collections import Counter
 from dataclasses import dataclass
-from typing import Iterable, List, Sequence
+from typing import Dict, Iterable, List, Optional, Sequence
 
 import networkx as nx
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.feature_extraction.text import TfidfVectorizer
+from rapidfuzz import utils
+from scipy import sparse
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
 
 from .models import NormalizedReference
 
+TOPIC_HASH_FEATURES = 2**18
+
 
 @dataclass
 class ClusterSummary:
@@ -22,23 +26,51 @@ class ClusterSummary:
     metadata: dict
 
 
-def build_author_clusters(references: Sequence[NormalizedReference], minimum_size: int = 2) -> List[ClusterSummary]:
+def _cooccurrence_graph(groups: Sequence[Sequence[str]]) -> nx.Graph:
+    """Build a weighted co-occurrence graph from per-reference entity lists.
+
+    Entities are laid out as a sparse references x entities indicator matrix
+    ``X``; the off-diagonal of ``X.T @ X`` gives the pairwise edge weights.
+    A name repeated within one reference counts once for that reference.
+    """
+    entity_ids: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    for row, names in enumerate(groups):
+        for name in dict.fromkeys(names):
+            rows.append(row)
+            cols.append(entity_ids.setdefault(name, len(entity_ids)))
+
     graph = nx.Graph()
-    for ref in references:
-        author_names = [author.name for author in ref.authors if author.name]
-        for name in author_names:
-            graph.add_node(name)
-        for i, author_a in enumerate(author_names):
-            for author_b in author_names[i + 1 :]:
-                if graph.has_edge(author_a, author_b):
-                    graph[author_a][author_b]["weight"] += 1
-                else:
-                    graph.add_edge(author_a, author_b, weight=1)
+    graph.add_nodes_from(entity_ids)
+    if not entity_ids:
+        return graph
+
+    indicator = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+        shape=(len(groups), len(entity_ids)),
+    )
+    cooccurrence = sparse.triu(indicator.T @ indicator, k=1).tocoo()
+    names = list(entity_ids)
+    graph.add_weighted_edges_from(
+        (names[i], names[j], int(weight)) for i, j, weight in zip(cooccurrence.row, cooccurrence.col, cooccurrence.data)
+    )
+    return graph
+
+
+def _detect_communities(graph: nx.Graph) -> List[set]:
+    """Louvain modularity communities, largest first (seeded for reproducible labels)."""
+    communities = nx.algorithms.community.louvain_communities(graph, weight="weight", seed=42)
+    return sorted(communities, key=len, reverse=True)
+
+
+def build_author_clusters(references: Sequence[NormalizedReference], minimum_size: int = 2) -> List[ClusterSummary]:
+    graph = _cooccurrence_graph([[author.name for author in ref.authors if author.name] for ref in references])
 
     if graph.number_of_nodes() == 0:
         return []
 
-    communities = nx.algorithms.community.greedy_modularity_communities(graph, weight="weight")
+    communities = _detect_communities(graph)
     clusters: List[ClusterSummary] = []
     for idx, community in enumerate(communities, start=1):
         members = sorted(list(community))
@@ -56,23 +88,21 @@ def build_author_clusters(references: Sequence[NormalizedReference], minimum_siz
 
 
 def build_org_clusters(references: Sequence[NormalizedReference], minimum_size: int = 2) -> List[ClusterSummary]:
-    graph = nx.Graph()
+    org_groups: List[List[str]] = []
+    node_types: Dict[str, Optional[str]] = {}
     for ref in references:
         org_names = [aff.name for aff in ref.affiliations if aff.name]
         org_types = {aff.name: aff.type for aff in ref.affiliations if aff.name and aff.type}
         for org in org_names:
-            graph.add_node(org, type=org_types.get(org))
-        for i, org_a in enumerate(org_names):
-            for org_b in org_names[i + 1 :]:
-                if graph.has_edge(org_a, org_b):
-                    graph[org_a][org_b]["weight"] += 1
-                else:
-                    graph.add_edge(org_a, org_b, weight=1)
+            node_types[org] = org_types.get(org)
+        org_groups.append(org_names)
+    graph = _cooccurrence_graph(org_groups)
+    nx.set_node_attributes(graph, node_types, "type")
 
     if graph.number_of_nodes() == 0:
         return []
 
-    communities = nx.algorithms.community.greedy_modularity_communities(graph, weight="weight")
+    communities = _detect_communities(graph)
     clusters: List[ClusterSummary] = []
     for idx, community in enumerate(communities, start=1):
         members = sorted(list(community))
@@ -90,11 +120,53 @@ def build_org_clusters(references: Sequence[NormalizedReference], minimum_size:
     return clusters
 
 
-def build_topic_clusters(references: Sequence[NormalizedReference], desired_k: int = 8) -> List[ClusterSummary]:
+def _top_k_order(values: np.ndarray, top_n: int) -> np.ndarray:
+    """Positions of the ``top_n`` largest values, descending, via partial selection.
+
+    Ties keep index order, so the result equals ``np.argsort(-values, kind="stable")[:top_n]``.
+    """
+    if values.size > top_n:
+        # Keep every value tied with the cutoff; argpartition alone would pick among them arbitrarily.
+        cutoff = -np.partition(-values, top_n - 1)[top_n - 1]
+        candidates = np.flatnonzero(values >= cutoff)
+    else:
+        candidates = np.arange(values.size)
+    return candidates[np.argsort(-values[candidates], kind="stable")][:top_n]
+
+
+def _hashed_terms(vectorizer: HashingVectorizer, docs: Sequence[str]) -> Dict[int, str]:
+    """Map hashed column indices back to the terms of ``docs`` (first term wins on collision)."""
+    analyzer = vectorizer.build_analyzer()
+    terms = list(dict.fromkeys(token for doc in docs for token in analyzer(doc)))
+    if not terms:
+        return {}
+    term_matrix = vectorizer.transform(terms).tocsr()
+    columns: Dict[int, str] = {}
+    for row, term in enumerate(terms):
+        start, end = term_matrix.indptr[row], term_matrix.indptr[row + 1]
+        if end > start:
+            columns.setdefault(int(term_matrix.indices[start]), term)
+    return columns
+
+
+def build_topic_clusters(
+    references: Sequence[NormalizedReference],
+    desired_k: int = 8,
+    normalized_titles: Optional[Sequence[str]] = None,
+) -> List[ClusterSummary]:
+    """Cluster references by title/abstract terms.
+
+    ``normalized_titles`` may carry titles already passed through rapidfuzz's ``default_process``
+    (aligned with ``references``); abstracts are then normalized the same way and the vectorizer
+    skips its own lowercasing.
+    """
     corpus = []
     reference_indices = []
     for idx, ref in enumerate(references):
-        text_fragments = [ref.title or "", ref.abstract or ""]
+        if normalized_titles is not None:
+            text_fragments = [normalized_titles[idx], utils.default_process(ref.abstract) if ref.abstract else ""]
+        else:
+            text_fragments = [ref.title or "", ref.abstract or ""]
         combined = " ".join(fragment for fragment in text_fragments if fragment)
         if not combined.strip():
             continue
@@ -105,25 +177,38 @@ def build_topic_clusters(references: Sequence[NormalizedReference], desired_k: i
         return []
 
     k = min(desired_k, len(corpus))
-    vectorizer = TfidfVectorizer(max_features=5000, stop_words="english")
-    tfidf_matrix = vectorizer.fit_transform(corpus)
+    # Stateless hashing avoids building a vocabulary; IDF weighting is applied afterwards.
+    vectorizer = HashingVectorizer(
+        n_features=TOPIC_HASH_FEATURES,
+        alternate_sign=False,
+        stop_words="english",
+        norm=None,
+        lowercase=normalized_titles is None,
+    )
+    tfidf_matrix = TfidfTransformer().fit_transform(vectorizer.transform(corpus))
     if k <= 1:
         labels = np.zeros(len(corpus), dtype=int)
     else:
-        model = KMeans(n_clusters=k, random_state=42, n_init="auto")
+        model = MiniBatchKMeans(n_clusters=k, batch_size=min(1024, len(corpus)), n_init=3, random_state=42)
         labels = model.fit_predict(tfidf_matrix)
 
-    feature_names = vectorizer.get_feature_names_out()
+    # All centroids in one product: (k x n_docs membership) @ (n_docs x features), scaled by size.
+    n_docs = len(corpus)
+    sizes = np.bincount(labels, minlength=k)
+    membership = sparse.csr_matrix((np.ones(n_docs), (labels, np.arange(n_docs))), shape=(k, n_docs))
+    centroids = (sparse.diags(1.0 / np.maximum(sizes, 1)) @ membership @ tfidf_matrix).tocsr()
+
     clusters: List[ClusterSummary] = []
     for cluster_id in range(k):
-        indices = np.where(labels == cluster_id)[0]
-        if len(indices) == 0:
+        if sizes[cluster_id] == 0:
             continue
-        cluster_docs = tfidf_matrix[indices]
-        centroid = cluster_docs.mean(axis=0)
-        centroid = np.asarray(centroid).ravel()
-        top_indices = centroid.argsort()[-10:][::-1]
-        keywords = [feature_names[i] for i in top_indices if centroid[i] > 0]
+        indices = np.where(labels == cluster_id)[0]
+        # Only non-zero centroid weights can become keywords.
+        start, end = centroids.indptr[cluster_id], centroids.indptr[cluster_id + 1]
+        columns, weights = centroids.indices[start:end], centroids.data[start:end]
+        top_indices = columns[_top_k_order(weights, 10)]
+        terms = _hashed_terms(vectorizer, [corpus[i] for i in indices])
+        keywords = [terms[i] for i in top_indices if i in terms]
         members = [references[reference_indices[i]].title or references[reference_indices[i]].raw for i in indices]
         clusters.append(
             ClusterSummary(
@@ -4,44 +4,141 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import sqlite3
+import threading
 import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
 
 import orjson
 import requests
+from requests.adapters import HTTPAdapter
+
+from .normalize import normalize_doi
 
 LOGGER = logging.getLogger(__name__)
 
+try:
+    CITEIQ_VERSION = version("citeiq")
+except PackageNotFoundError:  # running from a source checkout
+    CITEIQ_VERSION = "0.1.0"
+
+DEFAULT_CONTACT = "metadata@citeiq.local"
 DEFAULT_HEADERS = {
-    "User-Agent": "CiteIQ/0.1 (mailto:metadata@citeiq.local)",
+    "User-Agent": f"CiteIQ/{CITEIQ_VERSION} (mailto:{DEFAULT_CONTACT})",
 }
+BULK_DOI_CHUNK = 40  # DOIs per filter query; keeps request URLs well under common length limits
+
+PageParser = Callable[[Dict[str, Any]], Tuple[List[Dict[str, Any]], Optional[str], int]]
+
+
+def cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Build a stable cache key; params are serialized with sorted keys."""
+    if not params:
+        return f"{url}?"
+    return f"{url}?{orjson.dumps(params, option=orjson.OPT_SORT_KEYS).decode('utf-8')}"
+
+
+def _legacy_cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Key used by the earlier file-per-entry cache (params serialized in insertion order)."""
+    return f"{url}?{orjson.dumps(params).decode('utf-8') if params else ''}"
+
+
+def _digest(key: str) -> bytes:
+    # Keys are not security sensitive; a 128-bit BLAKE2b digest is cheaper than SHA-256.
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
 
 
 class APICache:
-    """Simple file-based cache backed by JSON blobs on disk."""
+    """Cache of JSON payloads stored in a single SQLite database (``cache.db``).
+
+    The connection is shared between worker threads and guarded by a lock. Entries
+    written by earlier versions as ``<sha256>.json`` files in the same directory are
+    moved into the database the first time they are looked up.
+    """
 
     def __init__(self, cache_dir: Path) -> None:
         self.cache_dir = cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "cache.db"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS entries (key BLOB PRIMARY KEY, value BLOB NOT NULL)")
+            self._conn.commit()
 
-    def _key_to_path(self, key: str) -> Path:
-        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
-        return self.cache_dir / f"{digest}.json"
-
-    def get(self, key: str) -> Optional[Dict[str, Any]]:
-        path = self._key_to_path(key)
-        if not path.exists():
-            return None
+    def get(self, key: str, legacy_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (_digest(key),)).fetchone()
+        if row is None:
+            return self._import_legacy_entry(key, legacy_key or key)
         try:
-            return orjson.loads(path.read_bytes())
-        except Exception as exc:  # noqa: BLE001
-            LOGGER.warning("Failed to read cache entry %s: %s", path, exc)
+            return orjson.loads(row[0])
+        except orjson.JSONDecodeError as exc:
+            LOGGER.warning("Failed to read cache entry for %s: %s", key, exc)
             return None
 
     def set(self, key: str, value: Dict[str, Any]) -> None:
-        path = self._key_to_path(key)
-        path.write_bytes(orjson.dumps(value))
+        self._store(key, orjson.dumps(value))
+
+    def _store(self, key: str, payload: bytes) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO entries (key, value) VALUES (?, ?)", (_digest(key), payload))
+            self._conn.commit()
+
+    def _import_legacy_entry(self, key: str, legacy_key: str) -> Optional[Dict[str, Any]]:
+        path = self.cache_dir / f"{hashlib.sha256(legacy_key.encode('utf-8')).hexdigest()}.json"
+        try:
+            payload = path.read_bytes()
+            value = orjson.loads(payload)
+        except FileNotFoundError:
+            return None
+        except (OSError, orjson.JSONDecodeError) as exc:
+            # Unreadable files are left in place rather than silently discarded.
+            LOGGER.warning("Skipping legacy cache file %s: %s", path, exc)
+            return None
+        self._store(key, payload)
+        path.unlink(missing_ok=True)
+        return value
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class HostThrottle:
+    """Per-host politeness: caps in-flight requests and spaces out request starts.
+
+    Each host gets a semaphore (concurrency cap) and a token-bucket style
+    schedule so that requests start at most once every ``min_interval``
+    seconds, while the requests themselves are free to overlap.
+    """
+
+    def __init__(self, min_interval: float, max_concurrency: int) -> None:
+        self.min_interval = min_interval
+        self.max_concurrency = max(1, max_concurrency)
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @contextmanager
+    def slot(self, host: str) -> Iterator[None]:
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.Semaphore(self.max_concurrency))
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
 
 
 class ExternalMetadataService:
@@ -55,38 +152,129 @@ class ExternalMetadataService:
         unpaywall_endpoint: str = "https://api.unpaywall.org",
         email: Optional[str] = None,
         per_request_pause: float = 0.2,
+        max_workers: int = 8,
+        max_per_host: int = 3,
+        memory_cache_size: int = 4096,
     ) -> None:
         self.cache = APICache(cache_dir)
+        # In-process LRU in front of the disk cache for repeated lookups within a run.
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self.memory_cache_size = memory_cache_size
         self.crossref_endpoint = crossref_endpoint.rstrip("/")
         self.openalex_endpoint = openalex_endpoint.rstrip("/")
         self.unpaywall_endpoint = unpaywall_endpoint.rstrip("/")
         self.email = email
         self.per_request_pause = per_request_pause
+        self.max_workers = max(1, max_workers)
+        self.throttle = HostThrottle(per_request_pause, max_per_host)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Crossref routes requests carrying a real mailto to its faster "polite" pool.
+        self.session.headers.update(DEFAULT_HEADERS)
+        if email:
+            self.session.headers["User-Agent"] = f"CiteIQ/{CITEIQ_VERSION} (mailto:{email})"
+
+    def _cache_get(self, key: str, legacy_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        with self._memory_lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        cached = self.cache.get(key, legacy_key)
+        if cached:
+            self._remember(key, cached)
+        return cached
 
-    def _request_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
-        cache_key = f"{url}?{orjson.dumps(params).decode('utf-8') if params else ''}"
-        if cached := self.cache.get(cache_key):
+    def _cache_set(self, key: str, value: Dict[str, Any]) -> None:
+        self.cache.set(key, value)
+        self._remember(key, value)
+
+    def _remember(self, key: str, value: Dict[str, Any]) -> None:
+        with self._memory_lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_cache_size:
+                self._memory.popitem(last=False)
+
+    def _request_json(
+        self, url: str, params: Optional[Dict[str, Any]] = None, use_cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        key = cache_key(url, params)
+        if use_cache and (cached := self._cache_get(key, _legacy_cache_key(url, params))):
             return cached
-        headers = DEFAULT_HEADERS.copy()
-        if self.email:
-            headers["User-Agent"] = f"CiteIQ/0.1 (mailto:{self.email})"
         try:
-            response = requests.get(url, params=params, headers=headers, timeout=20)
+            with self.throttle.slot(urlsplit(url).netloc):
+                response = self.session.get(url, params=params, timeout=20)
             if response.status_code == 200:
-                payload = response.json()
-                self.cache.set(cache_key, payload)
-                time.sleep(self.per_request_pause)
+                payload = orjson.loads(response.content)
+                if use_cache:
+                    self._cache_set(key, payload)
                 return payload
             LOGGER.warning("Non-200 response %s for %s", response.status_code, url)
         except Exception as exc:  # noqa: BLE001
             LOGGER.warning("Failed request %s params=%s: %s", url, params, exc)
         return None
 
+    def _cursor_pages(self, url: str, params: Dict[str, Any], parse_page: PageParser) -> Iterator[Dict[str, Any]]:
+        """Yield items across cursor-paginated result pages (batch pages are not cached)."""
+        cursor: Optional[str] = "*"
+        seen = 0
+        while cursor:
+            payload = self._request_json(url, params={**params, "cursor": cursor}, use_cache=False)
+            if not payload:
+                return
+            items, cursor, total = parse_page(payload)
+            yield from items
+            seen += len(items)
+            if not items or seen >= total:
+                return
+
+    def _bulk_by_doi(
+        self,
+        dois: Iterable[str],
+        single_url: Callable[[str], str],
+        fetch_chunk: Callable[[Sequence[str]], Iterator[Tuple[str, Dict[str, Any]]]],
+    ) -> Dict[str, Dict[str, Any]]:
+        found: Dict[str, Dict[str, Any]] = {}
+        pending: List[str] = []
+        for doi in dict.fromkeys(normalize_doi(doi) for doi in dois if doi):
+            if cached := self._cache_get(cache_key(single_url(doi))):
+                found[doi] = cached
+            else:
+                pending.append(doi)
+        for start in range(0, len(pending), BULK_DOI_CHUNK):
+            chunk = pending[start : start + BULK_DOI_CHUNK]
+            for doi, payload in fetch_chunk(chunk):
+                if doi in found:
+                    continue
+                # Store under the single-DOI key so later per-DOI lookups hit the cache.
+                self._cache_set(cache_key(single_url(doi)), payload)
+                found[doi] = payload
+        return found
+
     # Crossref methods
+    def _crossref_work_url(self, doi: str) -> str:
+        return f"{self.crossref_endpoint}/works/{doi.lower()}"
+
     def crossref_get_work(self, doi: str) -> Optional[Dict[str, Any]]:
-        doi = doi.lower()
-        url = f"{self.crossref_endpoint}/works/{doi}"
-        return self._request_json(url)
+        return self._request_json(self._crossref_work_url(doi))
+
+    def crossref_get_works_many(self, dois: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Resolve many DOIs via ``filter=doi:...`` in chunks of BULK_DOI_CHUNK, keyed by normalized DOI."""
+
+        def parse_page(payload: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Optional[str], int]:
+            message = payload.get("message") or {}
+            return message.get("items") or [], message.get("next-cursor"), message.get("total-results") or 0
+
+        def fetch_chunk(chunk: Sequence[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+            params = {"filter": ",".join(f"doi:{doi}" for doi in chunk), "rows": len(chunk)}
+            for item in self._cursor_pages(f"{self.crossref_endpoint}/works", params, parse_page):
+                if doi := item.get("DOI"):
+                    yield normalize_doi(doi), {"message": item}
+
+        return self._bulk_by_doi(dois, self._crossref_work_url, fetch_chunk)
 
     def crossref_search_bibliographic(self, query: str) -> Optional[Dict[str, Any]]:
         url = f"{self.crossref_endpoint}/works"
@@ -99,6 +287,21 @@ class ExternalMetadataService:
         url = f"{self.openalex_endpoint}/works/{identifier}"
         return self._request_json(url)
 
+    def openalex_search_many(self, dois: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Resolve many DOIs via ``filter=doi:D1|D2|...`` in chunks of BULK_DOI_CHUNK, keyed by normalized DOI."""
+
+        def parse_page(payload: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Optional[str], int]:
+            meta = payload.get("meta") or {}
+            return payload.get("results") or [], meta.get("next_cursor"), meta.get("count") or 0
+
+        def fetch_chunk(chunk: Sequence[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+            params = {"filter": f"doi:{'|'.join(chunk)}", "per-page": BULK_DOI_CHUNK}
+            for work in self._cursor_pages(f"{self.openalex_endpoint}/works", params, parse_page):
+                if doi := work.get("doi"):
+                    yield normalize_doi(doi), work
+
+        return self._bulk_by_doi(dois, lambda doi: f"{self.openalex_endpoint}/works/doi:{doi}", fetch_chunk)
+
     def openalex_search(self, doi: Optional[str] = None, title: Optional[str] = None) -> Optional[Dict[str, Any]]:
         url = f"{self.openalex_endpoint}/works"
         if doi:
@@ -4,60 +4,69 @@ from __future__ import annotations
 
 import re
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import bibtexparser
 
 from .models import Identifier, NormalizedReference, RawReference
 
-IEEE_ENTRY_RE = re.compile(r"^\s*\[?(\d+)\]?\s*(.+)", re.IGNORECASE)
+# Line-anchored entry marker: "[12]", "12." or "12)", or a bare "12" followed by whitespace.
+IEEE_ENTRY_RE = re.compile(r"^[ \t]*(?:\[(\d+)\]|(\d+)(?:[.)]|(?=\s|$)))[ \t]*", re.MULTILINE)
 DOI_RE = re.compile(r"10\.\d{4,9}/[-._;()/:A-Z0-9]+", re.IGNORECASE)
 PMID_RE = re.compile(r"PMID\s*[:\s]\s*(\d+)", re.IGNORECASE)
 ARXIV_RE = re.compile(r"arXiv\s*[:\s]\s*([0-9]+\.[0-9]+|[a-z-]+/[0-9]+)", re.IGNORECASE)
 URL_RE = re.compile(r"(https?://\S+)")
-YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
+YEAR_RE = re.compile(r"\b((?:19|20)\d{2})\b")
+# Single-pass scan for all identifier kinds; dispatch on ``match.lastgroup``.
+IDENTIFIER_RE = re.compile(
+    r"(?P<doi>10\.\d{4,9}/[-._;()/:A-Z0-9]+)"
+    r"|PMID\s*[:\s]\s*(?P<pmid>\d+)"
+    r"|arXiv\s*[:\s]\s*(?P<arxiv>[0-9]+\.[0-9]+|[a-z-]+/[0-9]+)"
+    r"|(?P<url>https?://\S+)",
+    re.IGNORECASE,
+)
+_URL_INNER_PATTERNS = (("doi", DOI_RE), ("pmid", PMID_RE), ("arxiv", ARXIV_RE))
 
 
 def _split_ieee_entries(text: str) -> List[Tuple[Optional[int], str]]:
     entries: List[Tuple[Optional[int], str]] = []
-    current_index: Optional[int] = None
-    current_chunks: List[str] = []
-
-    for raw_line in text.splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-        match = IEEE_ENTRY_RE.match(line)
-        if match:
-            if current_chunks:
-                entries.append((current_index, " ".join(current_chunks).strip()))
-                current_chunks = []
-            current_index = int(match.group(1))
-            remainder = match.group(2).strip()
-            if remainder:
-                current_chunks.append(remainder)
-        else:
-            if current_chunks:
-                current_chunks.append(line)
-            else:
-                current_chunks = [line]
+    markers = list(IEEE_ENTRY_RE.finditer(text))
+
+    # Text before the first numbered marker is kept as an unnumbered entry.
+    preamble = " ".join(text[: markers[0].start() if markers else len(text)].split())
+    if preamble:
+        entries.append((None, preamble))
 
-    if current_chunks:
-        entries.append((current_index, " ".join(current_chunks).strip()))
+    for marker, following in zip(markers, markers[1:] + [None]):
+        end = following.start() if following else len(text)
+        chunk = " ".join(text[marker.end() : end].split())
+        if chunk:
+            entries.append((int(marker.group(1) or marker.group(2)), chunk))
 
     return entries
 
 
 def _identifiers_from_text(text: str) -> List[Identifier]:
+    found: Dict[str, str] = {}
+    urls: List[str] = []
+    for match in IDENTIFIER_RE.finditer(text):
+        kind = match.lastgroup
+        assert kind is not None  # every alternative is a named group
+        value = match.group(kind)
+        if kind == "url":
+            urls.append(value)
+            # A URL swallows any identifier it wraps (resolver, arXiv or PubMed links), so look inside it.
+            for inner_kind, pattern in _URL_INNER_PATTERNS:
+                if inner_kind not in found and (inner := pattern.search(value)):
+                    found[inner_kind] = inner.group(inner.lastindex or 0)
+        else:
+            found.setdefault(kind, value)
+
     identifiers: List[Identifier] = []
-    if doi_match := DOI_RE.search(text):
-        identifiers.append(Identifier(type="DOI", value=doi_match.group(0)))
-    if pmid_match := PMID_RE.search(text):
-        identifiers.append(Identifier(type="PMID", value=pmid_match.group(1)))
-    if arxiv_match := ARXIV_RE.search(text):
-        identifiers.append(Identifier(type="arXiv", value=arxiv_match.group(1)))
-    for url_match in URL_RE.findall(text):
-        identifiers.append(Identifier(type="URL", value=url_match))
+    for kind, label in (("doi", "DOI"), ("pmid", "PMID"), ("arxiv", "arXiv")):
+        if kind in found:
+            identifiers.append(Identifier(type=label, value=found[kind]))
+    identifiers.extend(Identifier(type="URL", value=url) for url in urls)
     return identifiers
 
 
@@ -76,19 +85,16 @@ def read_plaintext_references(path: Path, source_label: Optional[str] = None) ->
 
 
 def read_bibtex(path: Path, source_label: Optional[str] = None) -> List[NormalizedReference]:
-    parser = bibtexparser.bparser.BibTexParser(common_strings=True)
-    with path.open("r", encoding="utf-8") as handle:
-        database = bibtexparser.load(handle, parser=parser)
+    library = bibtexparser.parse_file(str(path), encoding="utf-8")
 
     normalized: List[NormalizedReference] = []
-    for entry in database.entries:
+    for block in library.entries:
+        entry = {field.key.lower(): field.value for field in block.fields}
         title = entry.get("title")
         year = entry.get("year")
-        try:
-            year_int = int(year)
-        except (TypeError, ValueError):
-            year_int = None
-        raw_ref = entry.get("note") or title or entry.get("ID", "")
+        year_int = int(year) if year is not None and str(year).strip().isdigit() else None
+        issn = entry.get("issn")
+        raw_ref = entry.get("note") or title or block.key or ""
         identifiers: List[Identifier] = []
         if doi := entry.get("doi"):
             identifiers.append(Identifier(type="DOI", value=doi))
@@ -102,9 +108,9 @@ def read_bibtex(path: Path, source_label: Optional[str] = None) -> List[Normaliz
                 year=year_int,
                 venue=entry.get("booktitle") or entry.get("journal"),
                 publisher=entry.get("publisher"),
-                type=entry.get("ENTRYTYPE"),
+                type=block.entry_type.lower(),
                 identifiers=identifiers,
-                issn_isbn=[entry.get("issn")] if entry.get("issn") else [],
+                issn_isbn=[issn] if issn else [],
                 url=entry.get("url"),
                 source_file=source_label or path.name,
             )
@@ -116,20 +122,25 @@ def extract_initial_metadata(raw_refs: Iterable[RawReference]) -> List[Normalize
     normalized: List[NormalizedReference] = []
     for raw in raw_refs:
         identifiers = _identifiers_from_text(raw.raw)
-        year = None
-        if year_match := YEAR_RE.search(raw.raw):
-            try:
-                year = int(year_match.group(0))
-            except ValueError:
-                year = None
+        year_match = YEAR_RE.search(raw.raw)
         normalized.append(
             NormalizedReference(
                 raw=raw.raw,
                 index=raw.index,
                 identifiers=identifiers,
                 type=None,
-                year=year,
+                year=int(year_match.group(1)) if year_match else None,
                 source_file=raw.source_file,
             )
         )
     return normalized
+
+
+def parse_input_file(path: Path) -> List[NormalizedReference]:
+    """Parse one BibTeX or plain-text input file.
+
+    Top-level and free of heavy imports so it can run in a worker process.
+    """
+    if path.suffix.lower() == ".bib":
+        return read_bibtex(path, source_label=path.name)
+    return extract_initial_metadata(read_plaintext_references(path, source_label=path.name))
@@ -1,11 +1,17 @@
-"""Pydantic models that capture the normalized citation schema and scoring artefacts."""
+"""Models that capture the normalized citation schema and scoring artefacts.
+
+The reference schema (``NormalizedReference`` and its parts) uses slotted
+dataclasses because it is constructed and copied for every reference during
+ingest and enrichment; scoring artefacts remain Pydantic models.
+"""
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional, Sequence
+from typing import FrozenSet, Optional, Sequence, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, PrivateAttr, model_validator
 
 
 class CitationFlag(str, Enum):
@@ -19,49 +25,53 @@ class CitationFlag(str, Enum):
     LACKS_IDENTIFIER = "lacks_identifier"
 
 
-class Identifier(BaseModel):
+@dataclass(slots=True)
+class Identifier:
     type: str
     value: str
 
 
-class Author(BaseModel):
+@dataclass(slots=True)
+class Author:
     name: str
     orcid: Optional[str] = None
-    affiliations: Sequence[str] = Field(default_factory=list)
-    affiliation_ror: Sequence[str] = Field(default_factory=list)
+    affiliations: Sequence[str] = field(default_factory=list)
+    affiliation_ror: Sequence[str] = field(default_factory=list)
 
 
-class Affiliation(BaseModel):
+@dataclass(slots=True)
+class Affiliation:
     name: str
     ror: Optional[str] = None
     type: Optional[str] = None
 
 
-class NormalizedReference(BaseModel):
+@dataclass(slots=True)
+class NormalizedReference:
     raw: str
     index: Optional[int] = None
     source_file: Optional[str] = None
     title: Optional[str] = None
-    authors: Sequence[Author] = Field(default_factory=list)
+    authors: Sequence[Author] = field(default_factory=list)
     year: Optional[int] = None
     venue: Optional[str] = None
     publisher: Optional[str] = None
     type: Optional[str] = None
-    identifiers: Sequence[Identifier] = Field(default_factory=list)
-    issn_isbn: Sequence[str] = Field(default_factory=list)
+    identifiers: Sequence[Identifier] = field(default_factory=list)
+    issn_isbn: Sequence[str] = field(default_factory=list)
     url: Optional[str] = None
     abstract: Optional[str] = None
-    topics: Sequence[str] = Field(default_factory=list)
-    affiliations: Sequence[Affiliation] = Field(default_factory=list)
+    topics: Sequence[str] = field(default_factory=list)
+    affiliations: Sequence[Affiliation] = field(default_factory=list)
     citation_count: Optional[int] = None
     is_open_access: Optional[bool] = None
     best_oa_location: Optional[str] = None
-    related_identifiers: Sequence[Identifier] = Field(default_factory=list)
+    related_identifiers: Sequence[Identifier] = field(default_factory=list)
     is_retracted: Optional[bool] = None
     is_preprint: Optional[bool] = None
-    updates: Sequence[Identifier] = Field(default_factory=list)
-    version_of: Sequence[Identifier] = Field(default_factory=list)
-    indexed_in: Sequence[str] = Field(default_factory=list)
+    updates: Sequence[Identifier] = field(default_factory=list)
+    version_of: Sequence[Identifier] = field(default_factory=list)
+    indexed_in: Sequence[str] = field(default_factory=list)
 
     @property
     def doi(self) -> Optional[str]:
@@ -108,10 +118,23 @@ class CitationScore(BaseModel):
 
 
 class CitationRecord(BaseModel):
+    model_config = ConfigDict(validate_assignment=True)
+
     reference: NormalizedReference
     score: CitationScore
-    flags: List[CitationFlag] = Field(default_factory=list)
+    # A tuple so flags change only through ``add_flag`` or reassignment, which both
+    # refresh the ``_flagset`` mirror used for O(1) membership.
+    flags: Tuple[CitationFlag, ...] = ()
+    _flagset: FrozenSet[CitationFlag] = PrivateAttr(default_factory=frozenset)
+
+    @model_validator(mode="after")
+    def _sync_flagset(self) -> CitationRecord:
+        self._flagset = frozenset(self.flags)
+        return self
+
+    def has_flag(self, flag: CitationFlag) -> bool:
+        return flag in self._flagset
 
     def add_flag(self, flag: CitationFlag) -> None:
-        if flag not in self.flags:
-            self.flags.append(flag)
+        if flag not in self._flagset:
+            self.flags = (*self.flags, flag)
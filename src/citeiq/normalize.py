@@ -2,12 +2,24 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
 from typing import Any, Dict, List, Optional, Sequence
 
 from dateutil import parser as date_parser
 
 from .models import Affiliation, Author, Identifier, NormalizedReference
 
+DOI_PREFIXES = ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "http://dx.doi.org/", "doi:")
+
+
+def normalize_doi(value: str) -> str:
+    """Lowercase a DOI and strip resolver URL or ``doi:`` prefixes."""
+    doi = value.strip().lower()
+    for prefix in DOI_PREFIXES:
+        if doi.startswith(prefix):
+            return doi[len(prefix) :]
+    return doi
+
 
 def _first_str(value: Optional[Sequence[str]]) -> Optional[str]:
     if not value:
@@ -18,6 +30,18 @@ def _first_str(value: Optional[Sequence[str]]) -> Optional[str]:
     return None
 
 
+def _doi_keys(identifiers: Sequence[Identifier]) -> set[str]:
+    return {normalize_doi(id_.value) for id_ in identifiers if id_.type.lower() == "doi"}
+
+
+def _extend_unique(values: List[str], additions: Sequence[str]) -> None:
+    seen = set(values)
+    for value in additions:
+        if value not in seen:
+            seen.add(value)
+            values.append(value)
+
+
 def _date_to_year(date_parts: Any) -> Optional[int]:
     if isinstance(date_parts, dict):
         parts = date_parts.get("date-parts") or date_parts.get("date_parts")
@@ -38,6 +62,19 @@ def _date_to_year(date_parts: Any) -> Optional[int]:
     return None
 
 
+def _abstract_from_inverted_index(inverted: Dict[str, Sequence[int]]) -> str:
+    """Rebuild an OpenAlex abstract from its word -> positions index."""
+    all_indices = [idx for indices in inverted.values() for idx in indices]
+    if not all_indices:
+        return ""
+    abstract_words = [""] * (max(all_indices) + 1)
+    for word, positions in inverted.items():
+        for pos in positions:
+            abstract_words[pos] = word
+    # Positions missing from the index leave empty slots; skip them rather than emit double spaces.
+    return " ".join(word for word in abstract_words if word)
+
+
 def merge_crossref(reference: NormalizedReference, crossref_data: Dict[str, Any]) -> NormalizedReference:
     work = crossref_data.get("message") if crossref_data else None
     if not work:
@@ -64,18 +101,13 @@ def merge_crossref(reference: NormalizedReference, crossref_data: Dict[str, Any]
 
     identifiers = list(reference.identifiers)
     doi = work.get("DOI")
-    if doi:
-        if not any(id_.type.lower() == "doi" and id_.value.lower() == doi.lower() for id_ in identifiers):
-            identifiers.append(Identifier(type="DOI", value=doi))
+    if doi and normalize_doi(doi) not in _doi_keys(identifiers):
+        identifiers.append(Identifier(type="DOI", value=doi))
 
     issn_isbn = list(reference.issn_isbn)
-    for issn in work.get("ISSN", []):
-        if issn not in issn_isbn:
-            issn_isbn.append(issn)
+    _extend_unique(issn_isbn, work.get("ISSN", []))
     if isbn := work.get("ISBN"):
-        for value in isbn if isinstance(isbn, list) else [isbn]:
-            if value not in issn_isbn:
-                issn_isbn.append(value)
+        _extend_unique(issn_isbn, isbn if isinstance(isbn, list) else [isbn])
 
     related_identifiers = list(reference.related_identifiers)
     updates: List[Identifier] = list(reference.updates)
@@ -97,24 +129,23 @@ def merge_crossref(reference: NormalizedReference, crossref_data: Dict[str, Any]
     if work.get("type") == "posted-content":
         is_preprint = True
 
-    return reference.model_copy(
-        update={
-            "title": title,
-            "venue": container,
-            "publisher": work.get("publisher") or reference.publisher,
-            "year": issued_year,
-            "type": work.get("type") or reference.type,
-            "authors": authors or reference.authors,
-            "issn_isbn": issn_isbn,
-            "identifiers": identifiers,
-            "citation_count": work.get("is-referenced-by-count") or reference.citation_count,
-            "url": work.get("URL") or reference.url,
-            "is_retracted": (work.get("assertion")[0].get("label") == "retraction" if work.get("assertion") and len(work.get("assertion")) > 0 else reference.is_retracted),
-            "related_identifiers": related_identifiers,
-            "updates": updates,
-            "version_of": version_of,
-            "is_preprint": is_preprint,
-        }
+    return replace(
+        reference,
+        title=title,
+        venue=container,
+        publisher=work.get("publisher") or reference.publisher,
+        year=issued_year,
+        type=work.get("type") or reference.type,
+        authors=authors or reference.authors,
+        issn_isbn=issn_isbn,
+        identifiers=identifiers,
+        citation_count=work.get("is-referenced-by-count") or reference.citation_count,
+        url=work.get("URL") or reference.url,
+        is_retracted=(work.get("assertion")[0].get("label") == "retraction" if work.get("assertion") and len(work.get("assertion")) > 0 else reference.is_retracted),
+        related_identifiers=related_identifiers,
+        updates=updates,
+        version_of=version_of,
+        is_preprint=is_preprint,
     )
 
 
@@ -135,6 +166,7 @@ def merge_openalex(reference: NormalizedReference, openalex_data: Dict[str, Any]
 
     authors: List[Author] = []
     affiliations: List[Affiliation] = []
+    seen_affiliations: set[tuple[str, Optional[str]]] = set()
     for authorship in work.get("authorships", []):
         author_info = authorship.get("author", {})
         institutions = authorship.get("institutions", [])
@@ -152,29 +184,21 @@ def merge_openalex(reference: NormalizedReference, openalex_data: Dict[str, Any]
             name = inst.get("display_name")
             if not name:
                 continue
-            aff = Affiliation(name=name, ror=inst.get("ror"), type=inst.get("type"))
-            if aff not in affiliations:
-                affiliations.append(aff)
+            key = (name, inst.get("ror"))
+            if key not in seen_affiliations:
+                seen_affiliations.add(key)
+                affiliations.append(Affiliation(name=name, ror=inst.get("ror"), type=inst.get("type")))
 
     topics = [concept.get("display_name") for concept in work.get("concepts", []) if concept.get("display_name")]
     abstract = ""
     if inverted := work.get("abstract_inverted_index"):
-        # Flatten indexes preserving order
-        all_indices = [idx for indices in inverted.values() for idx in indices]
-        if all_indices:
-            abstract_words = [""] * (max(all_indices) + 1)
-            for word, positions in inverted.items():
-                for pos in positions:
-                    if pos < len(abstract_words):
-                        abstract_words[pos] = word
-            abstract = " ".join(abstract_words)
+        abstract = _abstract_from_inverted_index(inverted)
 
     identifiers = list(reference.identifiers)
     if openalex_id := work.get("id"):
         identifiers.append(Identifier(type="OpenAlex", value=openalex_id))
-    if doi := work.get("doi"):
-        if not any(id_.type.lower() == "doi" and id_.value.lower() == doi.lower() for id_ in identifiers):
-            identifiers.append(Identifier(type="DOI", value=doi))
+    if (doi := work.get("doi")) and normalize_doi(doi) not in _doi_keys(identifiers):
+        identifiers.append(Identifier(type="DOI", value=doi))
 
     is_preprint = reference.is_preprint
     host_venue = work.get("host_venue", {})
@@ -197,29 +221,26 @@ def merge_openalex(reference: NormalizedReference, openalex_data: Dict[str, Any]
     best_location = oa.get("oa_url") or reference.best_oa_location
 
     indexed_in = list(reference.indexed_in)
-    for inst in work.get("indexed_in", []):
-        if inst not in indexed_in:
-            indexed_in.append(inst)
-
-    return reference.model_copy(
-        update={
-            "title": title,
-            "year": year,
-            "citation_count": citation_count,
-            "authors": authors or reference.authors,
-            "affiliations": affiliations or reference.affiliations,
-            "topics": topics or reference.topics,
-            "abstract": abstract or reference.abstract,
-            "identifiers": identifiers,
-            "is_preprint": is_preprint,
-            "is_retracted": is_retracted if is_retracted is not None else reference.is_retracted,
-            "best_oa_location": best_location,
-            "is_open_access": is_oa if is_oa is not None else reference.is_open_access,
-            "updates": updates,
-            "version_of": version_of,
-            "venue": host_venue.get("display_name") or reference.venue,
-            "indexed_in": indexed_in,
-        }
+    _extend_unique(indexed_in, work.get("indexed_in", []))
+
+    return replace(
+        reference,
+        title=title,
+        year=year,
+        citation_count=citation_count,
+        authors=authors or reference.authors,
+        affiliations=affiliations or reference.affiliations,
+        topics=topics or reference.topics,
+        abstract=abstract or reference.abstract,
+        identifiers=identifiers,
+        is_preprint=is_preprint,
+        is_retracted=is_retracted if is_retracted is not None else reference.is_retracted,
+        best_oa_location=best_location,
+        is_open_access=is_oa if is_oa is not None else reference.is_open_access,
+        updates=updates,
+        version_of=version_of,
+        venue=host_venue.get("display_name") or reference.venue,
+        indexed_in=indexed_in,
     )
 
 
@@ -229,10 +250,9 @@ def merge_unpaywall(reference: NormalizedReference, unpaywall_data: Dict[str, An
     is_oa = unpaywall_data.get("is_oa")
     best = unpaywall_data.get("best_oa_location") or {}
     oa_url = best.get("url_for_pdf") or best.get("url")
-    return reference.model_copy(
-        update={
-            "is_open_access": is_oa if is_oa is not None else reference.is_open_access,
-            "best_oa_location": oa_url or reference.best_oa_location,
-        }
+    return replace(
+        reference,
+        is_open_access=is_oa if is_oa is not None else reference.is_open_access,
+        best_oa_location=oa_url or reference.best_oa_location,
     )
 
@@ -3,22 +3,108 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
-from rapidfuzz import fuzz
-
-LOGGER = logging.getLogger(__name__)
+from pydantic import TypeAdapter, ValidationError
+from rapidfuzz import fuzz, process, utils
 
 from .clustering import ClusterSummary, build_author_clusters, build_org_clusters, build_topic_clusters
 from .external import ExternalMetadataService
-from .ingest import extract_initial_metadata, read_bibtex, read_plaintext_references
-from .models import CitationFlag, CitationRecord, NormalizedReference, RawReference
-from .normalize import merge_crossref, merge_openalex, merge_unpaywall
-from .report import export_tabular_data, plot_preprint_share, plot_recency_histogram, plot_top_cited, records_to_dataframe, render_markdown_report
-from .scoring import ScoreInputs, build_citation_record
+from .ingest import parse_input_file
+from .models import CitationFlag, CitationRecord, NormalizedReference
+from .normalize import merge_crossref, merge_openalex, merge_unpaywall, normalize_doi
+from .report import (
+    DEFAULT_EXPORT_FORMATS,
+    export_tabular_data,
+    known_years,
+    most_cited,
+    plot_preprint_share,
+    plot_recency_histogram,
+    plot_top_cited,
+    records_to_dataframe,
+    render_markdown_report,
+)
+from .scoring import ScoreInputs, build_citation_records
+
+LOGGER = logging.getLogger(__name__)
+
+FUZZY_DUPLICATE_CUTOFF = 95  # token_sort_ratio score (0-100) at or above which titles are flagged
+LENGTH_BAND_MIN_BUCKET = 512  # buckets larger than this are scored in length bands instead of all-pairs
+LENGTH_BAND_CHUNK = 256
+CDIST_PARALLEL_MIN_QUERIES = 256  # smaller cdist calls run on the calling thread
+# Below this total input size, process start-up costs more than parallel parsing saves.
+PARALLEL_PARSE_MIN_BYTES = 2 * 1024 * 1024
+_PEER_REVIEWED_TYPES = frozenset({"journal-article", "proceedings-article", "book-chapter"})
+_PUBLISHED_VERSION_TYPES = frozenset({"is-preprint-of", "has-published-version"})
+
+# Bump when enrichment logic or the reference schema changes to invalidate memoized results.
+ENRICHMENT_CACHE_VERSION = 2
+_REFERENCE_ADAPTER = TypeAdapter(NormalizedReference)
+
+
+def _normalized_title(reference: NormalizedReference) -> str:
+    """Title (or raw text) through rapidfuzz's default processor; shared by dedup and topic clustering."""
+    return utils.default_process(reference.title or reference.raw)
+
+
+def _token_sort(normalized: str) -> str:
+    """Token-sort an already normalized title so pairwise scoring can use plain ``fuzz.ratio``."""
+    return " ".join(sorted(normalized.split()))
+
+
+def _dedup_block_key(reference: NormalizedReference) -> Tuple[Optional[int], str]:
+    if not reference.year:
+        return (None, "")
+    first_author = reference.authors[0].name if reference.authors else ""
+    return (reference.year, first_author.rsplit(" ", 1)[-1][:2].lower())
+
+
+def _similar_title_pairs(titles: Sequence[str], cutoff: int = FUZZY_DUPLICATE_CUTOFF) -> List[Tuple[int, int]]:
+    """Index pairs (i < j) of pre-sorted titles scoring at or above ``cutoff``."""
+    if len(titles) <= LENGTH_BAND_MIN_BUCKET:
+        # Titles are pre-sorted, so plain ratio equals token_sort_ratio without per-pair tokenizing.
+        scores = _ratio_matrix(titles, titles, cutoff)
+        rows, cols = np.nonzero(np.triu(scores >= cutoff, k=1))
+        return list(zip(rows.tolist(), cols.tolist()))
+
+    # Large buckets: ratio is bounded by 200 * short / (short + long), so a title can only reach the
+    # cutoff against titles at most (200 - cutoff) / cutoff times its length. Walking the titles in
+    # length order, each chunk is scored against that band only; no qualifying pair is skipped.
+    order = np.argsort([len(title) for title in titles], kind="stable")
+    ordered = [titles[i] for i in order]
+    lengths = np.fromiter((len(title) for title in ordered), dtype=np.int64, count=len(ordered))
+    stretch = (200 - cutoff) / cutoff
+    pairs: List[Tuple[int, int]] = []
+    for start in range(0, len(ordered), LENGTH_BAND_CHUNK):
+        stop = min(start + LENGTH_BAND_CHUNK, len(ordered))
+        band_end = int(np.searchsorted(lengths, lengths[stop - 1] * stretch + 1e-9, side="right"))
+        scores = _ratio_matrix(ordered[start:stop], ordered[start:band_end], cutoff)
+        rows, cols = np.nonzero(np.triu(scores >= cutoff, k=1))
+        for row, col in zip(order[rows + start].tolist(), order[cols + start].tolist()):
+            pairs.append((row, col) if row < col else (col, row))
+    pairs.sort()
+    return pairs
+
+
+def _ratio_matrix(queries: Sequence[str], choices: Sequence[str], cutoff: int = FUZZY_DUPLICATE_CUTOFF) -> np.ndarray:
+    return process.cdist(
+        queries,
+        choices,
+        scorer=fuzz.ratio,
+        processor=None,
+        score_cutoff=cutoff,
+        dtype=np.uint8,
+        # Starting a worker pool costs more than scoring a typical small blocking bucket.
+        workers=-1 if len(queries) >= CDIST_PARALLEL_MIN_QUERIES else 1,
+    )
 
 
 @dataclass
@@ -30,6 +116,13 @@ class PipelineConfig:
     sort_mode: str = "author"  # author | year | order
     topic_clusters: int = 8
     per_request_pause: float = 0.2
+    max_workers: int = 8  # concurrent API requests
+    parallel_enrich: int = 8  # references enriched concurrently
+    parse_workers: int = 4  # processes for parsing large multi-file inputs; 1 disables
+    export_formats: Sequence[str] = DEFAULT_EXPORT_FORMATS  # any of csv | parquet | xlsx
+    fuzzy_dedup: bool = True  # DOI-based duplicate detection always runs
+    fuzzy_dedup_threshold: int = FUZZY_DUPLICATE_CUTOFF  # token_sort_ratio score (0-100)
+    fuzzy_dedup_max_n: Optional[int] = None  # skip the fuzzy pass for larger bibliographies
 
 
 @dataclass
@@ -44,12 +137,37 @@ class PipelineResult:
     markdown_report_path: Path
 
 
+def reference_arrays(references: Sequence[NormalizedReference]) -> Dict[str, np.ndarray]:
+    """Struct-of-arrays view of the fields used for vectorized filtering and sorting.
+
+    Missing years and citation counts are encoded as -1.
+    """
+    count = len(references)
+    return {
+        "year": np.fromiter((ref.year or -1 for ref in references), dtype=np.int32, count=count),
+        "citation_count": np.fromiter(
+            (ref.citation_count if ref.citation_count is not None else -1 for ref in references),
+            dtype=np.int64,
+            count=count,
+        ),
+        "has_doi": np.fromiter((bool(ref.doi) for ref in references), dtype=bool, count=count),
+    }
+
+
 class ReferencePipeline:
     def __init__(self, config: PipelineConfig) -> None:
         self.config = config
         cache_dir = config.cache_dir or (config.output_dir / "cache")
         cache_dir.mkdir(parents=True, exist_ok=True)
-        self.external = ExternalMetadataService(cache_dir=cache_dir, email=config.email, per_request_pause=config.per_request_pause)
+        self.external = ExternalMetadataService(
+            cache_dir=cache_dir,
+            email=config.email,
+            per_request_pause=config.per_request_pause,
+            max_workers=config.max_workers,
+        )
+        # Bulk-resolved works keyed by normalized DOI; misses fall back to single-DOI lookups.
+        self._crossref_works: Dict[str, Dict[str, Any]] = {}
+        self._openalex_works: Dict[str, Dict[str, Any]] = {}
 
     def run(self) -> PipelineResult:
         LOGGER.info("=" * 60)
@@ -61,30 +179,36 @@ class ReferencePipeline:
         references, original_years, order_indices = self._ingest_all()
         
         # Analyze ingested references
-        with_doi = sum(1 for ref in references if ref.doi)
-        with_year = sum(1 for ref in references if ref.year)
+        arrays = reference_arrays(references)
+        with_doi = int(arrays["has_doi"].sum())
+        with_year = int((arrays["year"] > 0).sum())
         
-        LOGGER.info(f"✓ Found {len(references)} total references")
-        LOGGER.info(f"  - {with_doi} with DOI ({with_doi/len(references)*100:.1f}%)" if references else "  - 0 with DOI")
-        LOGGER.info(f"  - {with_year} with year ({with_year/len(references)*100:.1f}%)" if references else "  - 0 with year")
+        LOGGER.info("✓ Found %d total references", len(references))
+        total = len(references) or 1
+        LOGGER.info("  - %d with DOI (%.1f%%)", with_doi, with_doi / total * 100)
+        LOGGER.info("  - %d with year (%.1f%%)", with_year, with_year / total * 100)
         LOGGER.info("")
         
         if not references:
             LOGGER.warning("⚠ No references found in input files!")
             return self._empty_result()
         
-        LOGGER.info(f"🔍 Phase 2: Enriching metadata (fetching from APIs)...")
-        LOGGER.info(f"  This may take a while for {len(references)} references...")
-        
-        records: List[CitationRecord] = []
-        for idx, reference in enumerate(references, 1):
-            if idx % 10 == 0 or idx == 1 or idx == len(references):
-                LOGGER.info(f"  Processing {idx}/{len(references)}...")
-            
-            parsed_year = original_years[idx - 1]
-            reference, doi_resolved, has_published_version = self._enrich_reference(reference)
-
-            inputs = ScoreInputs(
+        LOGGER.info("🔍 Phase 2: Enriching metadata (fetching from APIs)...")
+        LOGGER.info("  This may take a while for %d references...", len(references))
+        self._bulk_resolve_dois(references)
+
+        # Enrichment is dominated by HTTP round trips, so references are enriched concurrently;
+        # ExternalMetadataService throttles per host. Results come back in input order.
+        enriched: List[Tuple[NormalizedReference, bool, bool]] = []
+        with ThreadPoolExecutor(max_workers=max(1, self.config.parallel_enrich)) as pool:
+            for idx, result in enumerate(pool.map(self._enrich_reference_cached, references), 1):
+                if idx % 10 == 0 or idx == 1 or idx == len(references):
+                    LOGGER.info("  Processing %d/%d...", idx, len(references))
+                enriched.append(result)
+
+        enriched_refs = [reference for reference, _, _ in enriched]
+        score_inputs = [
+            ScoreInputs(
                 raw_reference=reference.raw,
                 title_for_similarity=reference.title,
                 metadata_title=reference.title,
@@ -95,73 +219,99 @@ class ReferencePipeline:
                 has_published_version=has_published_version,
                 has_newer_version=bool(reference.updates),
                 is_preprint=bool(reference.is_preprint),
-                is_peer_reviewed=reference.type in {"journal-article", "proceedings-article", "book-chapter"},
+                is_peer_reviewed=reference.type in _PEER_REVIEWED_TYPES,
                 is_retracted=bool(reference.is_retracted),
                 is_open_access=reference.is_open_access,
                 indexed_in=reference.indexed_in,
                 citation_count=reference.citation_count,
             )
-            record = build_citation_record(reference, inputs)
-            records.append(record)
-        
+            for parsed_year, (reference, doi_resolved, has_published_version) in zip(original_years, enriched)
+        ]
+        # One clock read so the whole batch scores consistently.
+        records = build_citation_records(enriched_refs, score_inputs, datetime.now(UTC).year)
+
         LOGGER.info("✓ Enrichment complete")
         LOGGER.info("")
 
         LOGGER.info("🔎 Phase 3: Analyzing quality and detecting issues...")
-        duplicate_pairs = self._flag_duplicates(records)
+        normalized_titles = [_normalized_title(record.reference) for record in records]
+        duplicate_pairs = self._flag_duplicates(records, normalized_titles)
         
-        # Count flags
-        retractions = sum(1 for r in records if CitationFlag.RETRACTED in r.flags)
-        duplicates = sum(1 for r in records if CitationFlag.POSSIBLE_DUPLICATE in r.flags)
-        preprints = sum(1 for r in records if CitationFlag.PREPRINT in r.flags or r.reference.is_preprint)
-        unresolved_dois = sum(1 for r in records if CitationFlag.DOI_UNRESOLVED in r.flags)
-        mismatches = sum(1 for r in records if CitationFlag.METADATA_MISMATCH in r.flags)
+        # Count flags in a single pass (flags are unique per record)
+        flag_counts: Counter[CitationFlag] = Counter()
+        preprints = 0
+        for record in records:
+            flag_counts.update(record.flags)
+            if record.reference.is_preprint or record.has_flag(CitationFlag.PREPRINT):
+                preprints += 1
+        retractions = flag_counts[CitationFlag.RETRACTED]
+        duplicates = flag_counts[CitationFlag.POSSIBLE_DUPLICATE]
+        unresolved_dois = flag_counts[CitationFlag.DOI_UNRESOLVED]
+        mismatches = flag_counts[CitationFlag.METADATA_MISMATCH]
         
-        LOGGER.info(f"✓ Quality analysis complete:")
-        LOGGER.info(f"  - {retractions} retracted" + (" ⚠️" if retractions > 0 else ""))
-        LOGGER.info(f"  - {duplicates} possible duplicates" + (" ⚠️" if duplicates > 0 else ""))
-        LOGGER.info(f"  - {preprints} preprints")
-        LOGGER.info(f"  - {unresolved_dois} unresolved DOIs")
-        LOGGER.info(f"  - {mismatches} metadata mismatches")
+        LOGGER.info("✓ Quality analysis complete:")
+        LOGGER.info("  - %d retracted%s", retractions, " ⚠️" if retractions else "")
+        LOGGER.info("  - %d possible duplicates%s", duplicates, " ⚠️" if duplicates else "")
+        LOGGER.info("  - %d preprints", preprints)
+        LOGGER.info("  - %d unresolved DOIs", unresolved_dois)
+        LOGGER.info("  - %d metadata mismatches", mismatches)
         LOGGER.info("")
         
-        records = self._sort_records(records, order_indices)
+        order = self._sort_order(records, order_indices)
+        records = [records[i] for i in order]
+        normalized_titles = [normalized_titles[i] for i in order]
 
         LOGGER.info("📊 Phase 4: Generating reports and visualizations...")
         df = records_to_dataframe(records)
         self.config.output_dir.mkdir(parents=True, exist_ok=True)
-        export_tabular_data(df, self.config.output_dir)
-        LOGGER.info(f"  ✓ Exported CSV and XLSX to {self.config.output_dir}")
+        exported = export_tabular_data(df, self.config.output_dir, formats=self.config.export_formats)
+        LOGGER.info("  ✓ Exported %s to %s", ", ".join(path.name for path in exported), self.config.output_dir)
 
         LOGGER.info("  Clustering authors, organizations, and topics...")
-        author_clusters = build_author_clusters([record.reference for record in records])
-        org_clusters = build_org_clusters([record.reference for record in records])
-        topic_clusters = build_topic_clusters([record.reference for record in records], desired_k=self.config.topic_clusters)
-        LOGGER.info(f"  ✓ Found {len(author_clusters)} author clusters, {len(org_clusters)} org clusters, {len(topic_clusters)} topic clusters")
+        refs = [record.reference for record in records]
+        # Raw-text fallbacks are useful for dedup but would only add noise to topic terms.
+        topic_titles = [title if ref.title else "" for title, ref in zip(normalized_titles, refs)]
+        # The builders are independent; the cheap graph ones overlap with topic clustering.
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            author_future = pool.submit(build_author_clusters, refs)
+            org_future = pool.submit(build_org_clusters, refs)
+            topic_future = pool.submit(
+                build_topic_clusters, refs, desired_k=self.config.topic_clusters, normalized_titles=topic_titles
+            )
+            author_clusters, org_clusters, topic_clusters = author_future.result(), org_future.result(), topic_future.result()
+        LOGGER.info(
+            "  ✓ Found %d author clusters, %d org clusters, %d topic clusters",
+            len(author_clusters),
+            len(org_clusters),
+            len(topic_clusters),
+        )
 
         LOGGER.info("  Generating charts...")
-        charts = [
-            plot_recency_histogram(df, self.config.output_dir),
-            plot_preprint_share(records, self.config.output_dir),
-            plot_top_cited(df, self.config.output_dir),
-        ]
-        LOGGER.info(f"  ✓ Generated {len(charts)} charts")
+        # Charts use standalone Figure objects (no pyplot global state), so they can render in parallel.
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            chart_futures = [
+                pool.submit(plot_recency_histogram, known_years(df), self.config.output_dir),
+                pool.submit(plot_preprint_share, records, self.config.output_dir),
+                pool.submit(plot_top_cited, most_cited(df), self.config.output_dir),
+            ]
+            charts = [future.result() for future in chart_futures]
+        LOGGER.info("  ✓ Generated %d charts", len(charts))
 
         markdown = render_markdown_report(df, records, author_clusters, org_clusters, topic_clusters, charts)
         markdown_path = self.config.output_dir / "report.md"
         markdown_path.write_text(markdown, encoding="utf-8")
-        LOGGER.info(f"  ✓ Markdown report: {markdown_path}")
+        LOGGER.info("  ✓ Markdown report: %s", markdown_path)
         LOGGER.info("")
         
         # Final summary
         avg_score = df["score_total"].mean() if not df.empty else 0
         LOGGER.info("=" * 60)
         LOGGER.info("✅ Analysis complete!")
-        LOGGER.info(f"  📁 Output directory: {self.config.output_dir}")
-        LOGGER.info(f"  📄 {len(records)} references processed")
-        LOGGER.info(f"  📈 Average quality score: {avg_score:.1f}/100")
+        LOGGER.info("  📁 Output directory: %s", self.config.output_dir)
+        LOGGER.info("  📄 %d references processed", len(records))
+        LOGGER.info("  📈 Average quality score: %.1f/100", avg_score)
         if retractions > 0:
-            LOGGER.info(f"  ⚠️  {retractions} RETRACTED references found - review immediately!")
+            LOGGER.info("  ⚠️  %d RETRACTED references found - review immediately!", retractions)
         LOGGER.info("=" * 60)
 
         return PipelineResult(
@@ -198,35 +348,76 @@ class ReferencePipeline:
         order_indices: List[int] = []
         position = 0
 
-        LOGGER.info(f"  Reading {len(self.config.input_files)} input file(s)...")
-        for path in self.config.input_files:
-            count_before = len(references)
-            if path.suffix.lower() == ".bib":
-                normalized = read_bibtex(path, source_label=path.name)
-                for item in normalized:
-                    references.append(item)
-                    original_years.append(item.year)
-                    order_indices.append(position)
-                    position += 1
-            else:
-                raw_refs: List[RawReference] = read_plaintext_references(path, source_label=path.name)
-                normalized = extract_initial_metadata(raw_refs)
-                for item in normalized:
-                    references.append(item)
-                    original_years.append(item.year)
-                    order_indices.append(position)
-                    position += 1
-            count_added = len(references) - count_before
-            LOGGER.info(f"    • {path.name}: {count_added} reference(s)")
+        input_files = list(self.config.input_files)
+        LOGGER.info("  Reading %d input file(s)...", len(input_files))
+        workers = min(len(input_files), self.config.parse_workers)
+        if workers > 1 and sum(path.stat().st_size for path in input_files) >= PARALLEL_PARSE_MIN_BYTES:
+            # Parsing is CPU-bound; map() keeps results in input order so order_indices stay deterministic.
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed = list(pool.map(parse_input_file, input_files))
+        else:
+            parsed = [parse_input_file(path) for path in input_files]
+
+        for path, normalized in zip(input_files, parsed):
+            for item in normalized:
+                references.append(item)
+                original_years.append(item.year)
+                order_indices.append(position)
+                position += 1
+            LOGGER.info("    • %s: %d reference(s)", path.name, len(normalized))
         return references, original_years, order_indices
 
+    def _bulk_resolve_dois(self, references: Sequence[NormalizedReference]) -> None:
+        """Resolve all known DOIs with batched Crossref/OpenAlex filter queries before per-reference enrichment.
+
+        References whose enrichment is already memoized are skipped; they make no API calls at all.
+        """
+        dois = [
+            normalize_doi(ref.doi)
+            for ref in references
+            if ref.doi and self.external.cache.get(self._enrichment_cache_key(ref)) is None
+        ]
+        if not dois:
+            return
+        self._crossref_works = self.external.crossref_get_works_many(dois)
+        self._openalex_works = self.external.openalex_search_many(dois)
+
+    def _enrichment_cache_key(self, reference: NormalizedReference) -> str:
+        identity = normalize_doi(reference.doi) if reference.doi else reference.raw
+        return f"enriched:v{ENRICHMENT_CACHE_VERSION}:{'email' if self.config.email else 'anon'}:{identity}"
+
+    def _enrich_reference_cached(self, reference: NormalizedReference) -> Tuple[NormalizedReference, bool, bool]:
+        """Memoize enrichment results on disk (keyed by DOI or raw text) so re-runs skip all API calls."""
+        identity = normalize_doi(reference.doi) if reference.doi else reference.raw
+        key = self._enrichment_cache_key(reference)
+        if cached := self.external.cache.get(key):
+            try:
+                enriched = _REFERENCE_ADAPTER.validate_python(cached["reference"])
+                # Input-specific fields always come from the current run.
+                enriched = replace(enriched, raw=reference.raw, index=reference.index, source_file=reference.source_file)
+                return enriched, cached["doi_resolved"], cached["has_published_version"]
+            except (KeyError, ValidationError) as exc:
+                LOGGER.debug("Ignoring stale enrichment cache entry for %s: %s", identity, exc)
+
+        enriched, doi_resolved, has_published_version = self._enrich_reference(reference)
+        # The merge_* helpers return a new reference only when a payload was merged. Results where
+        # every lookup came back empty (often a transient API failure) are retried on the next run.
+        if doi_resolved or enriched is not reference:
+            self.external.cache.set(
+                key,
+                {"reference": enriched, "doi_resolved": doi_resolved, "has_published_version": has_published_version},
+            )
+        return enriched, doi_resolved, has_published_version
+
     def _enrich_reference(self, reference: NormalizedReference) -> Tuple[NormalizedReference, bool, bool]:
         doi_resolved = False
         has_published_version = False
 
         crossref_payload = None
         if reference.doi:
-            crossref_payload = self.external.crossref_get_work(reference.doi)
+            crossref_payload = self._crossref_works.get(normalize_doi(reference.doi))
+            if crossref_payload is None:
+                crossref_payload = self.external.crossref_get_work(reference.doi)
             doi_resolved = crossref_payload is not None
         if not crossref_payload:
             search = self.external.crossref_search_bibliographic(reference.raw)
@@ -235,13 +426,19 @@ class ReferencePipeline:
                 crossref_payload = {"message": best}
                 doi_resolved = bool(best.get("DOI"))
 
+        # A Crossref record with both DOI and authors is authoritative enough that a fuzzy
+        # OpenAlex title search would add nothing but another round trip.
+        crossref_message = crossref_payload.get("message", {}) if crossref_payload else {}
+        crossref_confident = bool(crossref_message.get("DOI") and crossref_message.get("author"))
         if crossref_payload:
             reference = merge_crossref(reference, crossref_payload)
 
         openalex_payload = None
         if reference.doi:
-            openalex_payload = self.external.openalex_get_work(f"doi:{reference.doi}")
-        if not openalex_payload and reference.title:
+            openalex_payload = self._openalex_works.get(normalize_doi(reference.doi))
+            if openalex_payload is None:
+                openalex_payload = self.external.openalex_get_work(f"doi:{reference.doi}")
+        if not openalex_payload and reference.title and not crossref_confident:
             openalex_payload = self.external.openalex_search(title=reference.title)
         if openalex_payload:
             reference = merge_openalex(reference, openalex_payload)
@@ -251,47 +448,70 @@ class ReferencePipeline:
             if unpaywall_payload:
                 reference = merge_unpaywall(reference, unpaywall_payload)
 
-        has_published_version = any(
-            identifier.type in {"is-preprint-of", "has-published-version"}
-            for identifier in reference.related_identifiers
+        has_published_version = not _PUBLISHED_VERSION_TYPES.isdisjoint(
+            identifier.type for identifier in reference.related_identifiers
         )
         return reference, doi_resolved, has_published_version
 
-    def _flag_duplicates(self, records: Sequence[CitationRecord]) -> List[Tuple[int, int]]:
+    def _flag_duplicates(
+        self, records: Sequence[CitationRecord], normalized_titles: Optional[Sequence[str]] = None
+    ) -> List[Tuple[int, int]]:
+        if normalized_titles is None:
+            normalized_titles = [_normalized_title(record.reference) for record in records]
         duplicates: List[Tuple[int, int]] = []
         doi_map: Dict[str, int] = {}
+        doi_keys: Dict[int, str] = {}
         for idx, record in enumerate(records):
             doi = record.reference.doi
             if doi:
-                doi_lower = doi.lower()
-                if doi_lower in doi_map:
-                    duplicates.append((doi_map[doi_lower], idx))
+                doi_key = normalize_doi(doi)
+                doi_keys[idx] = doi_key
+                if doi_key in doi_map:
+                    duplicates.append((doi_map[doi_key], idx))
                     record.add_flag(CitationFlag.POSSIBLE_DUPLICATE)
-                    records[doi_map[doi_lower]].add_flag(CitationFlag.POSSIBLE_DUPLICATE)
+                    records[doi_map[doi_key]].add_flag(CitationFlag.POSSIBLE_DUPLICATE)
                 else:
-                    doi_map[doi_lower] = idx
-
-        for i in range(len(records)):
-            title_i = records[i].reference.title or records[i].reference.raw
-            for j in range(i + 1, len(records)):
-                title_j = records[j].reference.title or records[j].reference.raw
-                similarity = fuzz.token_sort_ratio(title_i, title_j) / 100.0
-                if similarity >= 0.95:
-                    duplicates.append((i, j))
-                    records[i].add_flag(CitationFlag.POSSIBLE_DUPLICATE)
-                    records[j].add_flag(CitationFlag.POSSIBLE_DUPLICATE)
+                    doi_map[doi_key] = idx
+
+        max_n = self.config.fuzzy_dedup_max_n
+        if not self.config.fuzzy_dedup or (max_n is not None and len(records) > max_n):
+            return duplicates
+
+        # Titles that normalize to nothing would trivially match each other.
+        titles = [_token_sort(title) for title in normalized_titles]
+        # Blocking: only compare records that share (year, first-author prefix); missing years form one bucket.
+        buckets: Dict[Tuple[Optional[int], str], List[int]] = {}
+        for idx, record in enumerate(records):
+            if titles[idx]:
+                buckets.setdefault(_dedup_block_key(record.reference), []).append(idx)
+
+        cutoff = self.config.fuzzy_dedup_threshold
+        fuzzy_pairs: List[Tuple[int, int]] = []
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            fuzzy_pairs.extend((members[a], members[b]) for a, b in _similar_title_pairs([titles[idx] for idx in members], cutoff))
+        for i, j in sorted(fuzzy_pairs):
+            if i in doi_keys and doi_keys.get(j) == doi_keys[i]:
+                continue  # already paired by the DOI pass
+            duplicates.append((i, j))
+            records[i].add_flag(CitationFlag.POSSIBLE_DUPLICATE)
+            records[j].add_flag(CitationFlag.POSSIBLE_DUPLICATE)
         return duplicates
 
-    def _sort_records(self, records: List[CitationRecord], order_indices: Sequence[int]) -> List[CitationRecord]:
+    def _sort_order(self, records: Sequence[CitationRecord], order_indices: Sequence[int]) -> List[int]:
+        """Positions of ``records`` in report order, so parallel per-record lists can be permuted alike."""
         if self.config.sort_mode == "author":
-            return sorted(
-                records,
-                key=lambda record: (record.reference.authors[0].name.split()[-1].lower() if record.reference.authors else "", record.reference.year or 0),
-            )
+            # Decorate once so each surname is extracted a single time rather than inside the sort key.
+            decorated = [
+                ((record.reference.authors[0].name.rsplit(None, 1)[-1].lower() if record.reference.authors else "", record.reference.year or 0), idx)
+                for idx, record in enumerate(records)
+            ]
+            decorated.sort(key=itemgetter(0))
+            return [idx for _, idx in decorated]
         if self.config.sort_mode == "year":
-            return sorted(records, key=lambda record: record.reference.year or 0, reverse=True)
+            years = reference_arrays([record.reference for record in records])["year"]
+            return np.argsort(-years, kind="stable").tolist()
         if self.config.sort_mode == "order":
-            combined = list(zip(records, order_indices))
-            combined.sort(key=lambda item: item[1])
-            return [record for record, _ in combined]
-        return records
+            return sorted(range(len(records)), key=order_indices.__getitem__)
+        return list(range(len(records)))
@@ -2,59 +2,145 @@
 
 from __future__ import annotations
 
+import csv
+import os
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from openpyxl import Workbook
 
 from .clustering import ClusterSummary, top_entities
 from .models import CitationFlag, CitationRecord
 
 
+CHART_DPI = 150
+DEFAULT_EXPORT_FORMATS = ("csv", "parquet")
+
+# Explicit dtypes per column: Arrow-backed strings for text, nullable extension types elsewhere.
+_TEXT_COLUMNS = (
+    "raw", "title", "authors", "venue", "publisher", "type", "doi", "identifiers", "issn_isbn",
+    "best_oa_location", "topics", "flags",
+)
+_COLUMN_DTYPES = {
+    **dict.fromkeys(_TEXT_COLUMNS, "string[pyarrow]"),
+    "index": "Int64",
+    "year": "Int64",
+    "is_open_access": "boolean",
+    "has_flags": "bool",
+    "citation_count": "Int64",
+    "score_total": "float64",
+    "score_provenance": "float64",
+    "score_metadata": "float64",
+    "score_currency": "float64",
+    "score_reliability": "float64",
+    "score_impact": "float64",
+    "score_type": "float64",
+    "score_penalties": "float64",
+}
+
+
 def records_to_dataframe(records: Sequence[CitationRecord]) -> pd.DataFrame:
-    rows = []
+    # Column-major construction: one list per column, filled in a single pass.
+    columns: Dict[str, List[Any]] = {
+        name: []
+        for name in (
+            "index", "raw", "title", "authors", "year", "venue", "publisher", "type", "doi", "identifiers",
+            "issn_isbn", "is_open_access", "best_oa_location", "citation_count", "topics", "flags", "has_flags",
+            "score_total", "score_provenance", "score_metadata", "score_currency", "score_reliability",
+            "score_impact", "score_type", "score_penalties",
+        )
+    }
     for record in records:
         ref = record.reference
-        rows.append(
-            {
-                "index": ref.index,
-                "raw": ref.raw,
-                "title": ref.title,
-                "authors": "; ".join(author.name for author in ref.authors),
-                "year": ref.year,
-                "venue": ref.venue,
-                "publisher": ref.publisher,
-                "type": ref.type,
-                "doi": ref.doi,
-                "identifiers": "; ".join(f"{identifier.type}:{identifier.value}" for identifier in ref.identifiers),
-                "issn_isbn": "; ".join(ref.issn_isbn),
-                "is_open_access": ref.is_open_access,
-                "best_oa_location": ref.best_oa_location,
-                "citation_count": ref.citation_count,
-                "topics": "; ".join(ref.topics),
-                "flags": "; ".join(flag.value for flag in record.flags),
-                "score_total": record.score.total(),
-                "score_provenance": record.score.provenance,
-                "score_metadata": record.score.metadata_consistency,
-                "score_currency": record.score.currency,
-                "score_reliability": record.score.reliability,
-                "score_impact": record.score.impact,
-                "score_type": record.score.type_bonus,
-                "score_penalties": record.score.penalties,
-            }
-        )
-    df = pd.DataFrame(rows)
-    df.sort_values(by=["score_total"], ascending=False, inplace=True)
-    return df
+        score = record.score
+        columns["index"].append(ref.index)
+        columns["raw"].append(ref.raw)
+        columns["title"].append(ref.title)
+        columns["authors"].append("; ".join([author.name for author in ref.authors]))
+        columns["year"].append(ref.year)
+        columns["venue"].append(ref.venue)
+        columns["publisher"].append(ref.publisher)
+        columns["type"].append(ref.type)
+        columns["doi"].append(ref.doi)
+        columns["identifiers"].append("; ".join([f"{identifier.type}:{identifier.value}" for identifier in ref.identifiers]))
+        columns["issn_isbn"].append("; ".join(ref.issn_isbn))
+        columns["is_open_access"].append(ref.is_open_access)
+        columns["best_oa_location"].append(ref.best_oa_location)
+        columns["citation_count"].append(ref.citation_count)
+        columns["topics"].append("; ".join(ref.topics))
+        columns["flags"].append("; ".join([flag.value for flag in record.flags]))
+        columns["has_flags"].append(bool(record.flags))
+        columns["score_provenance"].append(score.provenance)
+        columns["score_metadata"].append(score.metadata_consistency)
+        columns["score_currency"].append(score.currency)
+        columns["score_reliability"].append(score.reliability)
+        columns["score_impact"].append(score.impact)
+        columns["score_type"].append(score.type_bonus)
+        columns["score_penalties"].append(score.penalties)
+        columns["score_total"].append(score.total())
+
+    df = pd.DataFrame(
+        {
+            name: pd.array(values, dtype=_COLUMN_DTYPES[name])
+            for name, values in columns.items()
+        }
+    )
+    # Stable descending order on the single numeric key; negating keeps ties in pipeline order.
+    totals = np.asarray(columns["score_total"], dtype=float)
+    return df.iloc[np.argsort(-totals, kind="stable")]
 
 
-def export_tabular_data(df: pd.DataFrame, output_dir: Path) -> None:
+def export_tabular_data(
+    df: pd.DataFrame, output_dir: Path, *, formats: Sequence[str] = DEFAULT_EXPORT_FORMATS
+) -> List[Path]:
+    """Write ``references.<format>`` for each requested format and return the paths written."""
+    unknown = [fmt for fmt in formats if fmt not in _TABLE_WRITERS]
+    if unknown:
+        raise ValueError(f"Unsupported export format(s): {', '.join(unknown)} (choose from {', '.join(_TABLE_WRITERS)})")
     output_dir.mkdir(parents=True, exist_ok=True)
-    csv_path = output_dir / "references.csv"
-    xlsx_path = output_dir / "references.xlsx"
-    df.to_csv(csv_path, index=False)
-    df.to_excel(xlsx_path, index=False)
+    paths = []
+    for fmt in dict.fromkeys(formats):
+        path = output_dir / f"references.{fmt}"
+        _TABLE_WRITERS[fmt](df, path)
+        paths.append(path)
+    return paths
+
+
+def _rows(df: pd.DataFrame, missing: Any) -> Iterator[Tuple[Any, ...]]:
+    """Plain row tuples with NaN / pd.NA replaced by ``missing``."""
+    return df.astype(object).where(df.notna(), missing).itertuples(index=False, name=None)
+
+
+def _write_csv(df: pd.DataFrame, path: Path) -> None:
+    """Write rows with the stdlib csv module through a large buffer; output matches ``to_csv(index=False)``."""
+    with path.open("w", encoding="utf-8", newline="", buffering=1 << 20) as handle:
+        writer = csv.writer(handle, lineterminator=os.linesep)
+        writer.writerow(df.columns)
+        writer.writerows(_rows(df, ""))
+
+
+def _write_parquet(df: pd.DataFrame, path: Path) -> None:
+    # Columnar and compressed: the fastest of the exports to reload downstream.
+    df.to_parquet(path, compression="zstd", index=False)
+
+
+def _write_xlsx(df: pd.DataFrame, path: Path) -> None:
+    """Stream rows through a write-only workbook; pandas' writer styles every cell."""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(list(df.columns))
+    for row in _rows(df, None):
+        sheet.append(row)
+    workbook.save(path)
+
+
+def _save_png(fig: Figure, path: Path) -> None:
+    # Render straight through the Agg canvas: no pyplot figure manager and no GUI backend lookup.
+    FigureCanvasAgg(fig).print_png(path)
 
 
 def _chart_base(output_dir: Path, filename: str) -> Path:
@@ -62,19 +148,30 @@ def _chart_base(output_dir: Path, filename: str) -> Path:
     return output_dir / filename
 
 
-def plot_recency_histogram(df: pd.DataFrame, output_dir: Path) -> Path:
-    filtered = df.dropna(subset=["year"])
-    if filtered.empty:
+def known_years(df: pd.DataFrame) -> np.ndarray:
+    """Publication years present in ``df``, as the float array ``plot_recency_histogram`` expects."""
+    return df["year"].dropna().to_numpy(dtype=float)
+
+
+def most_cited(df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
+    """The ``top_n`` most cited rows as ``label``/``citation_count`` columns, for ``plot_top_cited``."""
+    top = df[["title", "raw", "citation_count"]].dropna(subset=["citation_count"]).nlargest(top_n, "citation_count")
+    # Matplotlib cannot place pd.NA labels; untitled references are labelled by their raw text.
+    return pd.DataFrame({"label": top["title"].fillna(top["raw"]), "citation_count": top["citation_count"]})
+
+
+def plot_recency_histogram(years: np.ndarray, output_dir: Path) -> Path:
+    if len(years) == 0:
         return _chart_base(output_dir, "recency.png")
-    plt.figure(figsize=(6, 4))
-    plt.hist(filtered["year"], bins=10, color="#1f77b4", edgecolor="white")
-    plt.title("Publication Year Distribution")
-    plt.xlabel("Year")
-    plt.ylabel("Count")
+    fig = Figure(figsize=(6, 4), dpi=CHART_DPI)
+    ax = fig.subplots()
+    ax.hist(years, bins=10, color="#1f77b4", edgecolor="white")
+    ax.set_title("Publication Year Distribution")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Count")
     path = _chart_base(output_dir, "recency.png")
-    plt.tight_layout()
-    plt.savefig(path, dpi=150)
-    plt.close()
+    fig.tight_layout()
+    _save_png(fig, path)
     return path
 
 
@@ -82,38 +179,51 @@ def plot_preprint_share(records: Sequence[CitationRecord], output_dir: Path) ->
     preprints = sum(
         1
         for record in records
-        if record.reference.is_preprint or CitationFlag.PREFERS_PUBLISHED_VERSION in record.flags
+        if record.reference.is_preprint or record.has_flag(CitationFlag.PREFERS_PUBLISHED_VERSION)
     )
     total = len(records)
     if total == 0:
         return _chart_base(output_dir, "preprints.png")
-    plt.figure(figsize=(5, 5))
-    plt.pie([preprints, total - preprints], labels=["Preprint", "Peer-reviewed"], autopct="%1.0f%%", colors=["#ff7f0e", "#2ca02c"])
-    plt.title("Preprint vs Peer-reviewed")
+    fig = Figure(figsize=(5, 5), dpi=CHART_DPI)
+    ax = fig.subplots()
+    ax.pie([preprints, total - preprints], labels=["Preprint", "Peer-reviewed"], autopct="%1.0f%%", colors=["#ff7f0e", "#2ca02c"])
+    ax.set_title("Preprint vs Peer-reviewed")
     path = _chart_base(output_dir, "preprints.png")
-    plt.tight_layout()
-    plt.savefig(path, dpi=150)
-    plt.close()
+    fig.tight_layout()
+    _save_png(fig, path)
     return path
 
 
-def plot_top_cited(df: pd.DataFrame, output_dir: Path, top_n: int = 10) -> Path:
-    filtered = df.dropna(subset=["citation_count"])
-    if filtered.empty:
+def plot_top_cited(top: pd.DataFrame, output_dir: Path) -> Path:
+    if top.empty:
         return _chart_base(output_dir, "top_cited.png")
-    top = filtered.nlargest(top_n, "citation_count")
-    plt.figure(figsize=(8, 4))
-    plt.barh(top["title"], top["citation_count"], color="#9467bd")
-    plt.xlabel("Citation Count")
-    plt.ylabel("Title")
-    plt.title("Most Cited References")
-    plt.tight_layout()
+    fig = Figure(figsize=(8, 4), dpi=CHART_DPI)
+    ax = fig.subplots()
+    ax.barh(top["label"].tolist(), top["citation_count"].to_numpy(dtype=float), color="#9467bd")
+    ax.set_xlabel("Citation Count")
+    ax.set_ylabel("Title")
+    ax.set_title("Most Cited References")
+    fig.tight_layout()
     path = _chart_base(output_dir, "top_cited.png")
-    plt.savefig(path, dpi=150)
-    plt.close()
+    _save_png(fig, path)
     return path
 
 
+# XLSX is by far the slowest writer, so it is opt-in.
+_TABLE_WRITERS: Dict[str, Callable[[pd.DataFrame, Path], None]] = {
+    "csv": _write_csv,
+    "parquet": _write_parquet,
+    "xlsx": _write_xlsx,
+}
+EXPORT_FORMATS = tuple(_TABLE_WRITERS)
+
+
+def _org_cluster_line(cluster: ClusterSummary) -> str:
+    types = ", ".join(f"{k}: {v}" for k, v in cluster.metadata.get("types", {}).items())
+    suffix = f" ({types})" if types else ""
+    return f"- **{cluster.label}** ({cluster.size} organisations{suffix}): {', '.join(cluster.members)}"
+
+
 def render_markdown_report(
     df: pd.DataFrame,
     records: Sequence[CitationRecord],
@@ -124,66 +234,81 @@ def render_markdown_report(
 ) -> str:
     lines = ["# CiteIQ Reference Quality Report", ""]
     total = len(records)
-    flagged = sum(1 for record in records if record.flags)
-    preprints = sum(1 for record in records if record.reference.is_preprint)
-    retractions = sum(1 for record in records if CitationFlag.RETRACTED in record.flags)
-    lines.append(f"- Total references: **{total}**")
-    lines.append(f"- References with flags: **{flagged}**")
-    lines.append(f"- Preprints: **{preprints}**")
-    lines.append(f"- Retracted: **{retractions}**")
-    lines.append("")
+    # One pass gathers the summary counts and the author/organisation names.
+    flagged = preprints = retractions = 0
+    author_names: List[str] = []
+    org_names: List[str] = []
+    for record in records:
+        if record.flags:
+            flagged += 1
+            if record.has_flag(CitationFlag.RETRACTED):
+                retractions += 1
+        if record.reference.is_preprint:
+            preprints += 1
+        author_names.extend([author.name for author in record.reference.authors])
+        org_names.extend([affiliation.name for affiliation in record.reference.affiliations])
+    lines.extend(
+        [
+            f"- Total references: **{total}**",
+            f"- References with flags: **{flagged}**",
+            f"- Preprints: **{preprints}**",
+            f"- Retracted: **{retractions}**",
+            "",
+        ]
+    )
 
     if charts:
         lines.append("## Visuals")
-        for chart in charts:
-            lines.append(f"![{chart.stem}]({chart.name})")
+        lines.extend([f"![{chart.stem}]({chart.name})" for chart in charts])
         lines.append("")
 
     lines.append("## Top Authors")
-    author_counts = top_entities(author.name for record in records for author in record.reference.authors)
+    author_counts = top_entities(author_names)
     if author_counts:
-        for name, count in author_counts:
-            lines.append(f"- {name}: {count}")
+        lines.extend([f"- {name}: {count}" for name, count in author_counts])
     else:
         lines.append("_No authors available._")
     lines.append("")
 
     lines.append("## Top Organisations")
-    org_counts = top_entities(aff.name for record in records for aff in record.reference.affiliations)
+    org_counts = top_entities(org_names)
     if org_counts:
-        for name, count in org_counts:
-            lines.append(f"- {name}: {count}")
+        lines.extend([f"- {name}: {count}" for name, count in org_counts])
     else:
         lines.append("_No organisation data available._")
     lines.append("")
 
     if author_clusters:
         lines.append("## Author Clusters")
-        for cluster in author_clusters:
-            lines.append(f"- **{cluster.label}** ({cluster.size} members): {', '.join(cluster.members)}")
+        lines.extend([f"- **{cluster.label}** ({cluster.size} members): {', '.join(cluster.members)}" for cluster in author_clusters])
         lines.append("")
 
     if org_clusters:
         lines.append("## Organisation Clusters")
-        for cluster in org_clusters:
-            types = ", ".join(f"{k}: {v}" for k, v in cluster.metadata.get("types", {}).items())
-            suffix = f" ({types})" if types else ""
-            lines.append(f"- **{cluster.label}** ({cluster.size} organisations{suffix}): {', '.join(cluster.members)}")
+        lines.extend([_org_cluster_line(cluster) for cluster in org_clusters])
         lines.append("")
 
     if topic_clusters:
         lines.append("## Topic Clusters")
-        for cluster in topic_clusters:
-            keywords = ", ".join(cluster.metadata.get("keywords", [])[:5])
-            lines.append(f"- **{cluster.label}** ({cluster.size} items; keywords: {keywords})")
+        lines.extend(
+            [
+                f"- **{cluster.label}** ({cluster.size} items; keywords: {', '.join(cluster.metadata.get('keywords', [])[:5])})"
+                for cluster in topic_clusters
+            ]
+        )
         lines.append("")
 
     lines.append("## High-Risk References")
-    risky = df[df["flags"] != ""]
+    risky = df.loc[df["has_flags"].to_numpy(), ["title", "raw", "year", "flags"]]
     if risky.empty:
         lines.append("No risky references detected.")
     else:
-        for _, row in risky.iterrows():
-            lines.append(f"- **{row['title'] or row['raw']}** ({row['year']}): {row['flags']}")
+        # Missing cells are NaN / pd.NA, which are truthy, so fall back explicitly.
+        lines.extend(
+            [
+                f"- **{title if pd.notna(title) and title else raw}** ({year if pd.notna(year) else 'n.d.'}): {flags}"
+                for title, raw, year, flags in risky.itertuples(index=False, name=None)
+            ]
+        )
 
     return "\n".join(lines)
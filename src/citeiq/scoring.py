@@ -4,8 +4,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import Iterable, Optional, Sequence, Tuple
+from typing import Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 from rapidfuzz import fuzz
 
 from .models import CitationFlag, CitationRecord, CitationScore, NormalizedReference
@@ -30,106 +31,157 @@ class ScoreInputs:
     citation_count: Optional[int]
 
 
+TITLE_MATCH_STRONG = 90  # token_sort_ratio scores (0-100)
+TITLE_MATCH_WEAK = 75
+# Per-type bonuses; other types get none.
+_TYPE_BONUSES = {"standard": 10.0, "guideline": 10.0, "journal-article": 5.0, "proceedings-article": 5.0}
+
+
 def _title_similarity(candidate: Optional[str], metadata_title: Optional[str]) -> float:
+    """Return the 0-100 token-sort ratio, or 0 once it provably falls below ``TITLE_MATCH_WEAK``."""
     if not candidate or not metadata_title:
         return 0.0
-    return fuzz.token_sort_ratio(candidate, metadata_title) / 100.0
+    if candidate == metadata_title:
+        return 100.0
+    return fuzz.token_sort_ratio(candidate, metadata_title, score_cutoff=TITLE_MATCH_WEAK)
 
 
 def _author_presence_score(raw_reference: str, authors: Sequence[str]) -> float:
-    if not authors:
+    checked = authors[:5]
+    if not checked:
         return 0.0
+    raw_lower = raw_reference.lower()
     matches = 0
-    for author in authors[:5]:
-        last_name = author.split()[-1]
-        if last_name and last_name.lower() in raw_reference.lower():
+    for author in checked:
+        # rsplit(None, 1) takes the last whitespace-separated token without building the full list.
+        parts = author.rsplit(None, 1)
+        if parts and parts[-1].lower() in raw_lower:
             matches += 1
-    return matches / min(len(authors[:5]), 5)
-
-
-def compute_score(reference: NormalizedReference, inputs: ScoreInputs) -> Tuple[CitationScore, Iterable[CitationFlag]]:
-    flags: list[CitationFlag] = []
-    score = CitationScore()
+    return matches / len(checked)
+
+
+def compute_score(
+    reference: NormalizedReference, inputs: ScoreInputs, now_year: Optional[int] = None
+) -> Tuple[CitationScore, List[CitationFlag]]:
+    """Score one reference; pass ``now_year`` to score a batch against a single clock read."""
+    return compute_scores_batch([reference], [inputs], now_year)[0]
+
+
+def compute_scores_batch(
+    references: Sequence[NormalizedReference], inputs: Sequence[ScoreInputs], now_year: Optional[int] = None
+) -> List[Tuple[CitationScore, List[CitationFlag]]]:
+    """Score a batch of references, returning ``(score, flags)`` per reference in input order.
+
+    The rules run as NumPy array expressions; only the fuzzy title and author checks stay per record.
+    """
+    n = len(inputs)
+    if n == 0:
+        return []
+    if now_year is None:
+        now_year = datetime.now(UTC).year
+
+    def column(values: Iterable[object], dtype: type = bool) -> np.ndarray:
+        return np.fromiter(values, dtype=dtype, count=n)
+
+    has_doi = column(item.doi_resolved or bool(ref.doi) for ref, item in zip(references, inputs))
+    similarity = column(
+        (_title_similarity(item.title_for_similarity or item.raw_reference, item.metadata_title) for item in inputs), float
+    )
+    author_presence = column((_author_presence_score(item.raw_reference, item.authors) for item in inputs), float)
+    has_authors = column(bool(item.authors) for item in inputs)
+    metadata_year = column((item.metadata_year or 0 for item in inputs), np.int64)
+    parsed_year = column((item.parsed_year or 0 for item in inputs), np.int64)
+    has_newer_version = column(item.has_newer_version for item in inputs)
+    is_retracted = column(item.is_retracted for item in inputs)
+    is_peer_reviewed = column(item.is_peer_reviewed for item in inputs)
+    is_indexed = column(bool(item.indexed_in) for item in inputs)
+    is_open_access = column(bool(item.is_open_access) for item in inputs)
+    prefers_published = column(item.is_preprint and item.has_published_version for item in inputs)
+    citation_count = column((item.citation_count or 0 for item in inputs), float)
+    type_bonus = column((_TYPE_BONUSES.get(ref.type or "", 0.0) for ref in references), float)
 
     # Provenance
-    if inputs.doi_resolved or reference.doi:
-        score.provenance += 15
-    else:
-        score.penalties -= 30
-        flags.append(CitationFlag.DOI_UNRESOLVED)
+    provenance = np.where(has_doi, 15.0, 0.0)
+    penalties = np.where(has_doi, 0.0, -30.0)
 
     # Metadata consistency
-    similarity_candidate = inputs.title_for_similarity or inputs.raw_reference
-    similarity = _title_similarity(similarity_candidate, inputs.metadata_title)
-    if similarity >= 0.9:
-        score.metadata_consistency += 10
-    elif similarity >= 0.75:
-        score.metadata_consistency += 5
-    else:
-        score.penalties -= 15
-        flags.append(CitationFlag.METADATA_MISMATCH)
-
-    author_presence = _author_presence_score(inputs.raw_reference, inputs.authors)
-    if author_presence >= 0.8:
-        score.metadata_consistency += 5
-    elif author_presence < 0.3 and inputs.authors:
-        score.penalties -= 5
-        flags.append(CitationFlag.METADATA_MISMATCH)
-
-    # Year check
-    year_delta = None
-    if inputs.metadata_year and inputs.parsed_year:
-        year_delta = abs(inputs.metadata_year - inputs.parsed_year)
-    if year_delta is not None:
-        if year_delta == 0:
-            score.metadata_consistency += 5
-        elif year_delta == 1:
-            score.metadata_consistency += 2
-        elif year_delta > 1:
-            score.penalties -= 10
+    strong_title = similarity >= TITLE_MATCH_STRONG
+    title_mismatch = similarity < TITLE_MATCH_WEAK
+    metadata = np.where(strong_title, 10.0, np.where(title_mismatch, 0.0, 5.0))
+    penalties -= np.where(title_mismatch, 15.0, 0.0)
 
-    # Currency
-    now_year = datetime.now(UTC).year
-    years_since = None
-    if inputs.metadata_year:
-        years_since = max(0, now_year - inputs.metadata_year)
-        score.currency += max(0.0, 20.0 - years_since)
-
-    if inputs.has_newer_version:
-        score.penalties -= 20
-        flags.append(CitationFlag.HAS_NEWER_VERSION)
-
-    # Reliability
-    if inputs.is_retracted:
-        score.penalties -= 100  # Hard stop
-        flags.append(CitationFlag.RETRACTED)
-    else:
-        if inputs.is_peer_reviewed:
-            score.reliability += 10
-        if inputs.indexed_in:
-            score.reliability += 5
-        if inputs.is_open_access:
-            score.reliability += 3
-
-    if inputs.is_preprint and inputs.has_published_version:
-        flags.append(CitationFlag.PREFERS_PUBLISHED_VERSION)
+    author_mismatch = (author_presence < 0.3) & has_authors
+    metadata += np.where(author_presence >= 0.8, 5.0, 0.0)
+    penalties -= np.where(author_mismatch, 5.0, 0.0)
 
-    # Impact
-    if inputs.citation_count:
-        score.impact += min(10.0, max(0.0, 2.0 * (inputs.citation_count**0.5)))
+    both_years = (metadata_year != 0) & (parsed_year != 0)
+    year_delta = np.abs(metadata_year - parsed_year)
+    metadata += np.where(both_years & (year_delta == 0), 5.0, 0.0) + np.where(both_years & (year_delta == 1), 2.0, 0.0)
+    penalties -= np.where(both_years & (year_delta > 1), 10.0, 0.0)
 
-    # Type bonuses
-    if reference.type in {"standard", "guideline"}:
-        score.type_bonus += 10
-    elif reference.type in {"journal-article", "proceedings-article"}:
-        score.type_bonus += 5
-
-    return score, flags
-
-
-def build_citation_record(reference: NormalizedReference, inputs: ScoreInputs) -> CitationRecord:
-    score, flags = compute_score(reference, inputs)
-    record = CitationRecord(reference=reference, score=score, flags=list(flags))
-    if inputs.is_preprint and inputs.has_published_version:
-        record.add_flag(CitationFlag.PREFERS_PUBLISHED_VERSION)
-    return record
+    # Currency
+    years_since = np.maximum(0, now_year - metadata_year)
+    currency = np.where(metadata_year != 0, np.maximum(0.0, 20.0 - years_since), 0.0)
+
+    penalties -= np.where(has_newer_version, 20.0, 0.0)
+    # Reliability; a retraction is a hard stop
+    penalties -= np.where(is_retracted, 100.0, 0.0)
+    reliability = np.where(
+        is_retracted,
+        0.0,
+        np.where(is_peer_reviewed, 10.0, 0.0) + np.where(is_indexed, 5.0, 0.0) + np.where(is_open_access, 3.0, 0.0),
+    )
+    # Impact
+    impact = np.minimum(10.0, 2.0 * np.sqrt(np.maximum(citation_count, 0.0)))
+
+    # Flags are appended rule by rule, so each record lists them in rule order.
+    flags: List[List[CitationFlag]] = [[] for _ in range(n)]
+    for mask, flag in (
+        (~has_doi, CitationFlag.DOI_UNRESOLVED),
+        (title_mismatch, CitationFlag.METADATA_MISMATCH),
+        (author_mismatch, CitationFlag.METADATA_MISMATCH),
+        (has_newer_version, CitationFlag.HAS_NEWER_VERSION),
+        (is_retracted, CitationFlag.RETRACTED),
+        (prefers_published, CitationFlag.PREFERS_PUBLISHED_VERSION),
+    ):
+        for idx in np.flatnonzero(mask).tolist():
+            flags[idx].append(flag)
+
+    scores = [
+        CitationScore(
+            provenance=p,
+            metadata_consistency=m,
+            currency=c,
+            reliability=r,
+            impact=i,
+            type_bonus=t,
+            penalties=pen,
+        )
+        for p, m, c, r, i, t, pen in zip(
+            provenance.tolist(),
+            metadata.tolist(),
+            currency.tolist(),
+            reliability.tolist(),
+            impact.tolist(),
+            type_bonus.tolist(),
+            penalties.tolist(),
+        )
+    ]
+    return list(zip(scores, flags))
+
+
+def build_citation_records(
+    references: Sequence[NormalizedReference], inputs: Sequence[ScoreInputs], now_year: Optional[int] = None
+) -> List[CitationRecord]:
+    """Score references and wrap each in a ``CitationRecord``."""
+    # Title and author checks can both raise METADATA_MISMATCH; keep each flag once.
+    return [
+        CitationRecord(reference=reference, score=score, flags=tuple(dict.fromkeys(flags)))
+        for reference, (score, flags) in zip(references, compute_scores_batch(references, inputs, now_year))
+    ]
+
+
+def build_citation_record(
+    reference: NormalizedReference, inputs: ScoreInputs, now_year: Optional[int] = None
+) -> CitationRecord:
+    return build_citation_records([reference], [inputs], now_year)[0]
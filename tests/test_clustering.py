@@ -0,0 +1,133 @@
+import numpy as np
+from rapidfuzz import utils
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from citeiq.clustering import (
+    TOPIC_HASH_FEATURES,
+    _cooccurrence_graph,
+    _detect_communities,
+    _hashed_terms,
+    _top_k_order,
+    build_author_clusters,
+    build_org_clusters,
+    build_topic_clusters,
+)
+from citeiq.models import Affiliation, Author, NormalizedReference
+
+TOPIC_TITLES = [
+    "Protein folding with deep models",
+    "Protein folding dynamics",
+    "Simulating protein folding",
+    "Graph neural networks survey",
+    "Scalable graph neural networks",
+    "Graph networks for molecules",
+]
+
+# Two tightly connected author groups joined by a single C-D co-authorship.
+AUTHOR_GROUPS = [["A", "B"], ["A", "B", "C"], ["B", "C"], ["D", "E"], ["E", "F"], ["D", "F"], ["C", "D"]]
+
+
+def _references(titles: list[str]) -> list[NormalizedReference]:
+    return [NormalizedReference(raw=title, title=title) for title in titles]
+
+
+def test_build_topic_clusters_groups_titles_by_shared_terms() -> None:
+    clusters = build_topic_clusters(_references(TOPIC_TITLES), desired_k=2)
+
+    assert len(clusters) == 2
+    by_members = {frozenset(cluster.members): cluster for cluster in clusters}
+    protein = by_members[frozenset(TOPIC_TITLES[:3])]
+    graph = by_members[frozenset(TOPIC_TITLES[3:])]
+    assert protein.size == graph.size == 3
+    assert set(protein.metadata["keywords"][:2]) == {"protein", "folding"}
+    assert set(graph.metadata["keywords"][:2]) == {"graph", "networks"}
+    # Stop words never become keywords.
+    assert not {"with", "for"} & set(protein.metadata["keywords"] + graph.metadata["keywords"])
+
+
+def test_build_topic_clusters_accepts_pre_normalized_titles() -> None:
+    references = _references(TOPIC_TITLES)
+    normalized = [utils.default_process(title) for title in TOPIC_TITLES]
+
+    plain = build_topic_clusters(references, desired_k=2)
+    prenormalized = build_topic_clusters(references, desired_k=2, normalized_titles=normalized)
+
+    assert [(cluster.members, cluster.metadata) for cluster in prenormalized] == [
+        (cluster.members, cluster.metadata) for cluster in plain
+    ]
+
+
+def test_build_topic_clusters_needs_two_documents() -> None:
+    assert build_topic_clusters(_references(TOPIC_TITLES[:1])) == []
+    (cluster,) = build_topic_clusters(_references(TOPIC_TITLES[:2]), desired_k=1)
+    assert cluster.members == TOPIC_TITLES[:2]
+
+
+def test_hashed_terms_maps_columns_back_to_terms() -> None:
+    vectorizer = HashingVectorizer(n_features=TOPIC_HASH_FEATURES, alternate_sign=False, stop_words="english", norm=None)
+
+    terms = _hashed_terms(vectorizer, ["Graph networks for molecules", "graph survey"])
+
+    assert sorted(terms.values()) == ["graph", "molecules", "networks", "survey"]
+    for column, term in terms.items():
+        assert vectorizer.transform([term]).indices.tolist() == [column]
+    assert _hashed_terms(vectorizer, ["the and of"]) == {}
+
+
+def test_top_k_order_matches_a_full_stable_argsort() -> None:
+    values = np.array([0.5, 0.9, 0.5, 0.1, 0.9, 0.5, 0.3])
+
+    assert _top_k_order(values, 3).tolist() == [1, 4, 0]
+    for top_n in range(1, values.size + 2):
+        assert _top_k_order(values, top_n).tolist() == np.argsort(-values, kind="stable")[:top_n].tolist()
+
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        values = rng.integers(0, 4, size=int(rng.integers(1, 40))).astype(float)
+        top_n = int(rng.integers(1, 12))
+        assert _top_k_order(values, top_n).tolist() == np.argsort(-values, kind="stable")[:top_n].tolist()
+
+
+def test_cooccurrence_graph_weights_edges_by_shared_references() -> None:
+    graph = _cooccurrence_graph([["A", "B", "A"], ["A", "B", "C"], ["D"], []])
+
+    # "A" listed twice in one reference still counts once for that reference.
+    assert sorted(graph.edges(data="weight")) == [("A", "B", 2), ("A", "C", 1), ("B", "C", 1)]
+    assert sorted(graph.nodes) == ["A", "B", "C", "D"]
+    assert graph.degree("D") == 0
+    assert _cooccurrence_graph([[], []]).number_of_nodes() == 0
+
+
+def test_detect_communities_is_deterministic() -> None:
+    graph = _cooccurrence_graph(AUTHOR_GROUPS)
+
+    communities = _detect_communities(graph)
+
+    assert [sorted(community) for community in communities] == [["A", "B", "C"], ["D", "E", "F"]]
+    assert _detect_communities(_cooccurrence_graph(AUTHOR_GROUPS)) == communities
+
+
+def test_build_author_clusters_uses_communities() -> None:
+    references = [
+        NormalizedReference(raw=str(idx), authors=[Author(name=name) for name in names])
+        for idx, names in enumerate(AUTHOR_GROUPS)
+    ]
+
+    clusters = build_author_clusters(references)
+
+    assert [cluster.members for cluster in clusters] == [["A", "B", "C"], ["D", "E", "F"]]
+    assert build_author_clusters([NormalizedReference(raw="x")]) == []
+
+
+def test_build_org_clusters_counts_node_types() -> None:
+    mit = Affiliation(name="MIT", type="education")
+    google = Affiliation(name="Google", type="company")
+    references = [
+        NormalizedReference(raw="x", affiliations=[mit, google]),
+        NormalizedReference(raw="y", affiliations=[mit, google, Affiliation(name="Solo")]),
+    ]
+
+    (cluster,) = build_org_clusters(references)
+
+    assert cluster.members == ["Google", "MIT", "Solo"]
+    assert cluster.metadata == {"types": {"company": 1, "education": 1}}
@@ -0,0 +1,67 @@
+import hashlib
+from pathlib import Path
+
+import orjson
+
+from citeiq.external import CITEIQ_VERSION, APICache, ExternalMetadataService, cache_key
+
+
+def test_cache_key_is_independent_of_param_order() -> None:
+    assert cache_key("https://api.example.org/works", {"a": 1, "b": 2}) == cache_key(
+        "https://api.example.org/works", {"b": 2, "a": 1}
+    )
+
+
+def test_api_cache_round_trip(tmp_path: Path) -> None:
+    cache = APICache(tmp_path)
+    key = cache_key("https://api.example.org/works/10.1000/xyz")
+    assert cache.get(key) is None
+    cache.set(key, {"message": {"DOI": "10.1000/xyz"}})
+    assert cache.get(key) == {"message": {"DOI": "10.1000/xyz"}}
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload: dict) -> None:
+        self.content = orjson.dumps(payload)
+
+
+def test_crossref_get_works_many_caches_each_doi(tmp_path: Path, mocker) -> None:
+    service = ExternalMetadataService(cache_dir=tmp_path, per_request_pause=0.0)
+    items = [{"DOI": "10.1000/A"}, {"DOI": "10.1000/b"}]
+    get = mocker.patch.object(
+        service.session,
+        "get",
+        return_value=_FakeResponse({"message": {"items": items, "total-results": 2}}),
+    )
+
+    works = service.crossref_get_works_many(["https://doi.org/10.1000/a", "10.1000/B", "10.1000/a"])
+
+    assert set(works) == {"10.1000/a", "10.1000/b"}
+    assert get.call_count == 1
+    assert service.crossref_get_work("10.1000/A") == {"message": items[0]}
+    assert get.call_count == 1
+
+
+def test_api_cache_moves_legacy_files_into_the_database_on_lookup(tmp_path: Path) -> None:
+    url, params = "https://api.example.org/works", {"search": "graphs", "per-page": 3}
+    legacy_key = f"{url}?{orjson.dumps(params).decode('utf-8')}"
+    legacy_file = tmp_path / f"{hashlib.sha256(legacy_key.encode('utf-8')).hexdigest()}.json"
+    legacy_file.write_bytes(orjson.dumps({"results": []}))
+    broken_key = cache_key("https://api.example.org/works/10.1000/broken")
+    broken_file = tmp_path / f"{hashlib.sha256(broken_key.encode('utf-8')).hexdigest()}.json"
+    broken_file.write_bytes(b"{not json")
+    cache = APICache(tmp_path)
+
+    assert cache.get(cache_key(url, params), legacy_key) == {"results": []}
+    assert not legacy_file.exists()
+    assert cache.get(cache_key(url, params)) == {"results": []}
+    assert cache.get(broken_key) is None
+    assert broken_file.exists()
+
+
+def test_session_sends_polite_pool_user_agent(tmp_path: Path) -> None:
+    service = ExternalMetadataService(cache_dir=tmp_path, email="me@example.org")
+
+    assert service.session.headers["User-Agent"] == f"CiteIQ/{CITEIQ_VERSION} (mailto:me@example.org)"
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from citeiq.ingest import _identifiers_from_text, _split_ieee_entries, read_bibtex
+
+
+def test_identifiers_from_text_single_pass() -> None:
+    text = 'J. Doe, "Study," 2021, https://doi.org/10.1000/xyz PMID: 12345 arXiv:2101.00001'
+    identifiers = [(identifier.type, identifier.value) for identifier in _identifiers_from_text(text)]
+    assert identifiers == [
+        ("DOI", "10.1000/xyz"),
+        ("PMID", "12345"),
+        ("arXiv", "2101.00001"),
+        ("URL", "https://doi.org/10.1000/xyz"),
+    ]
+
+
+def test_identifiers_inside_urls_are_extracted() -> None:
+    cases = {
+        "https://arxiv.org/abs/arXiv:2101.00001": ("arXiv", "2101.00001"),
+        "https://export.arxiv.org/abs/arXiv:1706.03762v5": ("arXiv", "1706.03762"),
+        "https://pubmed.ncbi.nlm.nih.gov/?term=PMID:34567890": ("PMID", "34567890"),
+    }
+    for url, expected in cases.items():
+        found = _identifiers_from_text(f"J. Doe, 2021, {url}")
+        identifiers = [(identifier.type, identifier.value) for identifier in found]
+        assert identifiers == [expected, ("URL", url)]
+
+
+def test_split_ieee_entries_joins_continuation_lines() -> None:
+    text = '[1] J. Smith, "A",\n    IEEE, 2020.\n[2]A. Jones, pp. 123-130, 2021\n\n[3]\n   C. Lee, 2019.\n'
+    assert _split_ieee_entries(text) == [
+        (1, 'J. Smith, "A", IEEE, 2020.'),
+        (2, "A. Jones, pp. 123-130, 2021"),
+        (3, "C. Lee, 2019."),
+    ]
+    assert _split_ieee_entries("1) J. Smith, A.\n2) A. Jones, B.\n") == [(1, "J. Smith, A."), (2, "A. Jones, B.")]
+    assert _split_ieee_entries("1.J. Smith, A.\n2.A. Jones, B.\n") == [(1, "J. Smith, A."), (2, "A. Jones, B.")]
+
+
+def test_read_bibtex_maps_fields(tmp_path: Path) -> None:
+    path = tmp_path / "refs.bib"
+    path.write_text(
+        "@Article{smith2023,\n"
+        "  Title={Example Paper},\n"
+        "  journal={IEEE Conference},\n"
+        "  year={2023},\n"
+        "  doi={10.1109/example.2023}\n"
+        "}\n",
+        encoding="utf-8",
+    )
+    (reference,) = read_bibtex(path)
+    assert reference.title == "Example Paper"
+    assert reference.year == 2023
+    assert reference.type == "article"
+    assert reference.doi == "10.1109/example.2023"
+    assert reference.source_file == "refs.bib"
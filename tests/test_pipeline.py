@@ -0,0 +1,152 @@
+from pathlib import Path
+
+import numpy as np
+
+from citeiq.models import Author, CitationFlag, CitationRecord, CitationScore, Identifier, NormalizedReference
+from citeiq.pipeline import (
+    LENGTH_BAND_MIN_BUCKET,
+    PipelineConfig,
+    ReferencePipeline,
+    _ratio_matrix,
+    _similar_title_pairs,
+)
+
+
+def _record(title: str, doi: str | None = None, year: int | None = None, author: str | None = None) -> CitationRecord:
+    identifiers = [Identifier(type="DOI", value=doi)] if doi else []
+    authors = [Author(name=author)] if author else []
+    reference = NormalizedReference(raw=title, title=title, identifiers=identifiers, year=year, authors=authors)
+    return CitationRecord(reference=reference, score=CitationScore())
+
+
+def test_flag_duplicates_by_doi_and_title(tmp_path: Path) -> None:
+    pipeline = ReferencePipeline(PipelineConfig(input_files=[], output_dir=tmp_path))
+    records = [
+        _record("Deep learning for image recognition", doi="10.1000/abc"),
+        _record("Graph neural networks: a survey"),
+        _record("Another title entirely", doi="https://doi.org/10.1000/ABC"),
+        _record("graph neural networks - a survey."),
+    ]
+
+    pairs = pipeline._flag_duplicates(records)
+
+    assert pairs == [(0, 2), (1, 3)]
+    assert all(CitationFlag.POSSIBLE_DUPLICATE in record.flags for record in records)
+
+
+def test_doi_paired_records_still_match_titles_of_records_without_doi(tmp_path: Path) -> None:
+    pipeline = ReferencePipeline(PipelineConfig(input_files=[], output_dir=tmp_path))
+    records = [
+        _record("Graph neural networks: a survey", doi="10.1/a"),
+        _record("Graph neural networks: a survey", doi="10.1/A"),
+        _record("Graph neural networks: a survey"),
+    ]
+
+    assert pipeline._flag_duplicates(records) == [(0, 1), (0, 2), (1, 2)]
+
+
+def test_flag_duplicates_only_compares_within_blocks(tmp_path: Path) -> None:
+    pipeline = ReferencePipeline(PipelineConfig(input_files=[], output_dir=tmp_path))
+    records = [
+        _record("Deep learning for image recognition", year=2020, author="Jane Smith"),
+        _record("Deep learning for image recognition", year=2021, author="Jane Smith"),
+        _record("Deep Learning for Image Recognition", year=2020, author="J. Smith"),
+    ]
+
+    assert pipeline._flag_duplicates(records) == [(0, 2)]
+
+
+def test_enrichment_results_are_memoized_across_runs(tmp_path: Path, mocker) -> None:
+    config = PipelineConfig(input_files=[], output_dir=tmp_path)
+    reference = NormalizedReference(
+        raw="ref", index=1, identifiers=[Identifier(type="DOI", value="10.1000/ABC")], authors=[Author(name="Jane Smith")]
+    )
+    enriched = NormalizedReference(raw="ref", index=1, title="Enriched", authors=[Author(name="Jane Smith")])
+    enrich = mocker.patch.object(ReferencePipeline, "_enrich_reference", return_value=(enriched, True, False))
+
+    first = ReferencePipeline(config)._enrich_reference_cached(reference)
+    second = ReferencePipeline(config)._enrich_reference_cached(reference)
+
+    assert enrich.call_count == 1
+    assert second == first == (enriched, True, False)
+
+
+def test_failed_enrichment_is_not_memoized(tmp_path: Path, mocker) -> None:
+    config = PipelineConfig(input_files=[], output_dir=tmp_path)
+    reference = NormalizedReference(raw="ref", index=1, identifiers=[Identifier(type="DOI", value="10.1000/abc")])
+    enrich = mocker.patch.object(ReferencePipeline, "_enrich_reference", return_value=(reference, False, False))
+
+    ReferencePipeline(config)._enrich_reference_cached(reference)
+    ReferencePipeline(config)._enrich_reference_cached(reference)
+
+    assert enrich.call_count == 2
+
+
+def test_length_banded_title_pairs_match_all_pairs() -> None:
+    words = ["deep", "graph", "neural", "survey", "protein", "image", "model", "data"]
+    titles = sorted(
+        " ".join(words[(i * 7 + k) % len(words)] for k in range(2 + i % 9)) + ("s" if i % 3 else "")
+        for i in range(LENGTH_BAND_MIN_BUCKET + 100)
+    )
+
+    rows, cols = np.nonzero(np.triu(_ratio_matrix(titles, titles) >= 95, k=1))
+
+    assert _similar_title_pairs(titles) == list(zip(rows.tolist(), cols.tolist()))
+
+
+def test_confident_crossref_match_skips_openalex_title_search(tmp_path: Path, mocker) -> None:
+    pipeline = ReferencePipeline(PipelineConfig(input_files=[], output_dir=tmp_path))
+    crossref = {"message": {"DOI": "10.1000/abc", "title": ["A title"], "author": [{"given": "Jane", "family": "Smith"}]}}
+    mocker.patch.object(pipeline.external, "crossref_search_bibliographic", return_value={"message": {"items": [crossref["message"]]}})
+    mocker.patch.object(pipeline.external, "openalex_get_work", return_value=None)
+    title_search = mocker.patch.object(pipeline.external, "openalex_search")
+
+    reference, doi_resolved, _ = pipeline._enrich_reference(NormalizedReference(raw="Smith, A title"))
+
+    assert doi_resolved and reference.doi == "10.1000/abc"
+    title_search.assert_not_called()
+
+
+def test_doi_missing_from_bulk_lookup_falls_back_to_single_lookup(tmp_path: Path, mocker) -> None:
+    pipeline = ReferencePipeline(PipelineConfig(input_files=[], output_dir=tmp_path))
+    reference = NormalizedReference(raw="ref", identifiers=[Identifier(type="DOI", value="10.1000/abc")])
+    mocker.patch.object(pipeline.external, "crossref_get_works_many", return_value={})
+    mocker.patch.object(pipeline.external, "openalex_search_many", return_value={})
+    crossref = mocker.patch.object(
+        pipeline.external, "crossref_get_work", return_value={"message": {"DOI": "10.1000/abc", "title": ["A title"]}}
+    )
+    openalex = mocker.patch.object(pipeline.external, "openalex_get_work", return_value=None)
+    mocker.patch.object(pipeline.external, "openalex_search", return_value=None)
+
+    pipeline._bulk_resolve_dois([reference])
+    enriched, doi_resolved, _ = pipeline._enrich_reference(reference)
+
+    crossref.assert_called_once_with("10.1000/abc")
+    openalex.assert_called_once_with("doi:10.1000/abc")
+    assert doi_resolved and enriched.title == "A title"
+
+
+def test_small_inputs_are_parsed_without_worker_processes(tmp_path: Path, mocker) -> None:
+    inputs = []
+    for name in ("a.txt", "b.txt"):
+        path = tmp_path / name
+        path.write_text("[1] J. Smith, A title, 2020.\n[2] A. Doe, Another title, 2019.\n", encoding="utf-8")
+        inputs.append(path)
+    pool = mocker.patch("citeiq.pipeline.ProcessPoolExecutor")
+
+    references, years, _ = ReferencePipeline(PipelineConfig(input_files=inputs, output_dir=tmp_path))._ingest_all()
+
+    pool.assert_not_called()
+    assert len(references) == 4 and years == [2020, 2019, 2020, 2019]
+
+
+def test_fuzzy_dedup_can_be_disabled(tmp_path: Path) -> None:
+    pipeline = ReferencePipeline(PipelineConfig(input_files=[], output_dir=tmp_path, fuzzy_dedup=False))
+    records = [
+        _record("Deep learning for image recognition", doi="10.1000/abc"),
+        _record("Graph neural networks: a survey"),
+        _record("Another title entirely", doi="10.1000/ABC"),
+        _record("graph neural networks - a survey."),
+    ]
+
+    assert pipeline._flag_duplicates(records) == [(0, 2)]
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pandas as pd
+
+from citeiq.models import CitationFlag, CitationRecord, CitationScore, NormalizedReference
+from citeiq.report import export_tabular_data, records_to_dataframe, render_markdown_report
+
+
+def _records() -> list[CitationRecord]:
+    return [
+        CitationRecord(
+            reference=NormalizedReference(raw="A raw", title="A title", year=2020, citation_count=3),
+            score=CitationScore(provenance=15),
+        ),
+        CitationRecord(
+            reference=NormalizedReference(raw="B raw"),
+            score=CitationScore(provenance=30),
+            flags=[CitationFlag.DOI_UNRESOLVED],
+        ),
+    ]
+
+
+def test_export_tabular_data_writes_missing_values_as_empty_cells(tmp_path: Path) -> None:
+    df = records_to_dataframe(_records())
+
+    export_tabular_data(df, tmp_path, formats=("csv", "xlsx"))
+
+    assert (tmp_path / "references.csv").read_text(encoding="utf-8") == df.to_csv(index=False)
+
+    excel = pd.read_excel(tmp_path / "references.xlsx")
+    assert list(excel.columns) == list(df.columns)
+    assert excel["raw"].tolist() == ["B raw", "A raw"]
+    assert pd.isna(excel.loc[0, "year"]) and excel.loc[1, "year"] == 2020
+
+
+def test_high_risk_section_falls_back_to_raw_text_and_no_date() -> None:
+    records = _records()
+
+    markdown = render_markdown_report(records_to_dataframe(records), records, [], [], [], [])
+
+    assert markdown.endswith("## High-Risk References\n- **B raw** (n.d.): doi_unresolved")
+
+
+def test_export_tabular_data_round_trips_parquet_and_skips_xlsx_by_default(tmp_path: Path) -> None:
+    df = records_to_dataframe(_records())
+
+    export_tabular_data(df, tmp_path)
+
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / "references.parquet"), df.reset_index(drop=True))
+    assert not (tmp_path / "references.xlsx").exists()
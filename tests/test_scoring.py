@@ -1,5 +1,11 @@
-from citeiq.models import NormalizedReference
-from citeiq.scoring import ScoreInputs, compute_score
+from citeiq.models import CitationFlag, CitationRecord, CitationScore, Identifier, NormalizedReference
+from citeiq.scoring import (
+    ScoreInputs,
+    _author_presence_score,
+    build_citation_record,
+    compute_score,
+    compute_scores_batch,
+)
 
 
 def test_compute_score_basic() -> None:
@@ -29,3 +35,219 @@ def test_compute_score_basic() -> None:
     score, flags = compute_score(reference, inputs)
     assert score.total() > 50
     assert not list(flags)
+
+
+def test_build_citation_record_keeps_each_flag_once() -> None:
+    reference = NormalizedReference(raw="Unrelated text", title="Something else", year=2020)
+    inputs = ScoreInputs(
+        raw_reference=reference.raw,
+        title_for_similarity=reference.title,
+        metadata_title="A completely different title",
+        metadata_year=2020,
+        parsed_year=2020,
+        authors=["Jane Doe"],
+        doi_resolved=True,
+        has_published_version=False,
+        has_newer_version=False,
+        is_preprint=False,
+        is_peer_reviewed=False,
+        is_retracted=False,
+        is_open_access=None,
+        indexed_in=[],
+        citation_count=None,
+    )
+
+    record = build_citation_record(reference, inputs)
+
+    assert record.flags == (CitationFlag.METADATA_MISMATCH,)
+
+
+def test_compute_score_uses_supplied_now_year() -> None:
+    reference = NormalizedReference(raw="Doe, Example Study", title="Example Study", year=2010)
+    inputs = ScoreInputs(
+        raw_reference=reference.raw,
+        title_for_similarity=reference.title,
+        metadata_title=reference.title,
+        metadata_year=2010,
+        parsed_year=2010,
+        authors=[],
+        doi_resolved=True,
+        has_published_version=False,
+        has_newer_version=False,
+        is_preprint=False,
+        is_peer_reviewed=False,
+        is_retracted=False,
+        is_open_access=None,
+        indexed_in=[],
+        citation_count=None,
+    )
+
+    score, _ = compute_score(reference, inputs, now_year=2015)
+
+    assert score.currency == 15.0
+
+
+def test_compute_score_applies_each_rule() -> None:
+    reference = NormalizedReference(raw="Example Study", title="Example Study", type="standard")
+    inputs = ScoreInputs(
+        raw_reference=reference.raw,
+        title_for_similarity=reference.title,
+        metadata_title=reference.title,
+        metadata_year=2020,
+        parsed_year=2021,
+        authors=[],
+        doi_resolved=False,
+        has_published_version=True,
+        has_newer_version=False,
+        is_preprint=True,
+        is_peer_reviewed=True,
+        is_retracted=True,
+        is_open_access=True,
+        indexed_in=["PubMed"],
+        citation_count=4,
+    )
+
+    score, flags = compute_score(reference, inputs, now_year=2024)
+
+    assert score == CitationScore(
+        provenance=0.0,
+        metadata_consistency=12.0,
+        currency=16.0,
+        reliability=0.0,
+        impact=4.0,
+        type_bonus=10.0,
+        penalties=-130.0,
+    )
+    assert flags == [CitationFlag.DOI_UNRESOLVED, CitationFlag.RETRACTED, CitationFlag.PREFERS_PUBLISHED_VERSION]
+
+
+def _inputs(reference: NormalizedReference, **overrides: object) -> ScoreInputs:
+    values: dict = dict(
+        raw_reference=reference.raw,
+        title_for_similarity=reference.title,
+        metadata_title=reference.title,
+        metadata_year=reference.year,
+        parsed_year=reference.year,
+        authors=[],
+        doi_resolved=False,
+        has_published_version=False,
+        has_newer_version=False,
+        is_preprint=False,
+        is_peer_reviewed=False,
+        is_retracted=False,
+        is_open_access=None,
+        indexed_in=[],
+        citation_count=None,
+    )
+    values.update(overrides)
+    return ScoreInputs(**values)
+
+
+def test_compute_scores_batch_matches_pinned_scores() -> None:
+    with_doi = NormalizedReference(
+        raw="Smith J, Jones A. Deep nets for graphs. 2020.",
+        title="Deep nets for graphs",
+        year=2020,
+        type="journal-article",
+        identifiers=[Identifier(type="DOI", value="10.1000/x")],
+    )
+    survey = NormalizedReference(
+        raw="Jones A. Graph networks survey", title="Graph networks survey", year=2019, type="standard"
+    )
+    folding = NormalizedReference(
+        raw="Lee C. Protein folding at scale. 2015.",
+        title="Protein folding at scale",
+        year=2019,
+        type="proceedings-article",
+    )
+    untitled = NormalizedReference(raw="Untitled manuscript")
+    cases = [
+        (
+            with_doi,
+            _inputs(
+                with_doi,
+                authors=["Jane Smith", "Alan Jones"],
+                is_peer_reviewed=True,
+                indexed_in=["PubMed"],
+                is_open_access=True,
+                citation_count=16,
+            ),
+            (15.0, 20.0, 16.0, 18.0, 8.0, 5.0, 0.0),
+            [],
+        ),
+        (
+            survey,
+            _inputs(
+                survey,
+                metadata_title="A survey of graph neural networks",
+                parsed_year=2018,
+                doi_resolved=True,
+                authors=["A Jones"],
+            ),
+            (15.0, 7.0, 15.0, 0.0, 0.0, 10.0, -15.0),
+            [CitationFlag.METADATA_MISMATCH],
+        ),
+        (
+            survey,
+            _inputs(survey, metadata_title="Graph networks: survey", parsed_year=2018, authors=["B Brown"]),
+            (0.0, 12.0, 15.0, 0.0, 0.0, 10.0, -35.0),
+            [CitationFlag.DOI_UNRESOLVED, CitationFlag.METADATA_MISMATCH],
+        ),
+        (
+            folding,
+            _inputs(
+                folding,
+                parsed_year=2015,
+                doi_resolved=True,
+                has_newer_version=True,
+                is_preprint=True,
+                has_published_version=True,
+            ),
+            (15.0, 10.0, 15.0, 0.0, 0.0, 5.0, -30.0),
+            [CitationFlag.HAS_NEWER_VERSION, CitationFlag.PREFERS_PUBLISHED_VERSION],
+        ),
+        (
+            untitled,
+            _inputs(untitled),
+            (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, -45.0),
+            [CitationFlag.DOI_UNRESOLVED, CitationFlag.METADATA_MISMATCH],
+        ),
+    ]
+
+    results = compute_scores_batch([case[0] for case in cases], [case[1] for case in cases], now_year=2024)
+
+    for (_, _, expected_components, expected_flags), (score, flags) in zip(cases, results):
+        components = (
+            score.provenance,
+            score.metadata_consistency,
+            score.currency,
+            score.reliability,
+            score.impact,
+            score.type_bonus,
+            score.penalties,
+        )
+        assert components == expected_components
+        assert flags == expected_flags
+
+
+def test_author_presence_score_checks_first_five_authors_only() -> None:
+    raw = "Doe J, Smith A, Brown B. Example study. 2020."
+    authors = ["Jane Doe", "Alan Smith", "Bob Brown", "Carol White", "  ", "Dan Doe"]
+
+    assert _author_presence_score(raw, authors) == 3 / 5
+    assert _author_presence_score(raw, []) == 0.0
+
+
+def test_citation_record_flag_membership_tracks_flag_changes() -> None:
+    record = CitationRecord(reference=NormalizedReference(raw="x"), score=CitationScore(), flags=[CitationFlag.PREPRINT])
+
+    record.add_flag(CitationFlag.RETRACTED)
+    record.add_flag(CitationFlag.RETRACTED)
+
+    assert record.has_flag(CitationFlag.PREPRINT) and record.has_flag(CitationFlag.RETRACTED)
+    assert not record.has_flag(CitationFlag.POSSIBLE_DUPLICATE)
+    assert record.flags == (CitationFlag.PREPRINT, CitationFlag.RETRACTED)
+
+    record.flags = (CitationFlag.DOI_UNRESOLVED,)
+
+    assert record.has_flag(CitationFlag.DOI_UNRESOLVED) and not record.has_flag(CitationFlag.PREPRINT)